@@ -0,0 +1,2 @@
+# Game Drifters analytics engine: HenrikDev fetch, scoring and Sheets sync.
+# Importable without Streamlit, used by app.py and the headless `python -m drifters` CLI.
@@ -0,0 +1,130 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from . import metrics
+from .agents import fetch_icons
+from .refresh import run_refresh
+
+logger = logging.getLogger("drifters")
+
+# =========================================================
+# HEADLESS REFRESH
+#   python -m drifters refresh [--dry-run] [--summary PATH] [--metrics PATH] [--every MINUTES | --at HH:MM]
+#   python -m drifters icons [--force]
+#   python -m drifters bench [--players N,N] [--history N,N] [--repeat N] [--render] [--fixture PATH] [--json PATH]
+# =========================================================
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m drifters")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    refresh = commands.add_parser("refresh", help="fetch roster stats and sync them to the spreadsheet")
+    refresh.add_argument("--dry-run", action="store_true", help="fetch and score, but don't write to the spreadsheet")
+    refresh.add_argument("--summary", metavar="PATH", help="also write the JSON run summary to PATH")
+    refresh.add_argument("--metrics", metavar="PATH", help="write Prometheus-format metrics to PATH after each run (default: the METRICS_FILE secret)")
+
+    schedule = refresh.add_mutually_exclusive_group()
+    schedule.add_argument("--every", type=float, metavar="MINUTES", help="stay running and refresh every MINUTES")
+    schedule.add_argument("--at", metavar="HH:MM", help="stay running and refresh daily at HH:MM (local time)")
+
+    icons = commands.add_parser("icons", help="download agent thumbnails into static/agents/")
+    icons.add_argument("--force", action="store_true", help="re-download icons that are already on disk")
+
+    sizes = lambda text: [int(n) for n in text.split(",")]
+
+    bench = commands.add_parser("bench", help="time and memory per stage on synthetic data")
+    bench.add_argument("--players", type=sizes, default=[10, 1000, 10000], metavar="N,N", help="roster sizes (default 10,1000,10000)")
+    bench.add_argument("--history", type=sizes, default=[1000, 100000], metavar="N,N", help="history row counts (default 1000,100000)")
+    bench.add_argument("--repeat", type=int, default=3, help="timed runs per stage, the median is reported")
+    bench.add_argument("--render", action="store_true", help="also time full page runs (smallest roster, largest history)")
+    bench.add_argument("--fixture", metavar="PATH", help="a recorded v3 matches response to parse instead of the synthetic page")
+    bench.add_argument("--json", metavar="PATH", help="also write the results as JSON to PATH")
+
+    args = parser.parse_args(argv)
+
+    if args.command in ("icons", "bench"):
+        return args
+
+    if args.at:
+        try:
+            datetime.strptime(args.at, "%H:%M")
+        except ValueError:
+            parser.error(f"--at expects HH:MM, got {args.at!r}")
+
+    return args
+
+def refresh_once(args):
+    started = time.time()
+
+    def progress(processed, total, riot_id):
+        if riot_id:
+            logger.info("checked %d/%d %s", processed, total, riot_id)
+
+    try:
+        summary = {"status": "ok", **run_refresh(progress, dry_run=args.dry_run)}
+    except Exception as e:
+        logger.exception("refresh failed")
+        summary = {"status": "failed", "dry_run": args.dry_run, "error": str(e)}
+
+    summary["started_at"] = datetime.fromtimestamp(started).isoformat(timespec="seconds")
+    summary["duration_s"] = round(time.time() - started, 1)
+
+    text = json.dumps(summary, indent=2, default=str)
+    print(text, flush=True)
+
+    if args.summary:
+        Path(args.summary).write_text(text)
+
+    # counters are cumulative for the life of the process, so --every/--at runs keep adding up
+    metrics.write(args.metrics)
+
+    return summary["status"] == "ok"
+
+def next_run(args, now):
+    if args.every:
+        return now + timedelta(minutes=args.every)
+
+    hour, minute = map(int, args.at.split(":"))
+    run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    return run if run > now else run + timedelta(days=1)
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args = parse_args(argv)
+
+    if args.command == "icons":
+        result = fetch_icons(force=args.force)
+        print(json.dumps(result, indent=2), flush=True)
+        return 1 if result["failed"] else 0
+
+    if args.command == "bench":
+        from . import bench
+
+        results = bench.run(args.players, args.history, args.repeat, args.render, args.fixture)
+        print(bench.report(results), flush=True)
+
+        if args.json:
+            Path(args.json).write_text(json.dumps(results, indent=2))
+        return 0
+
+    # one-shot: exit code tells cron whether the run worked
+    if not (args.every or args.at):
+        return 0 if refresh_once(args) else 1
+
+    if args.every:
+        refresh_once(args)
+
+    while True:
+        run = next_run(args, datetime.now())
+        logger.info("next refresh at %s", run.isoformat(timespec="minutes"))
+        time.sleep(max(0, (run - datetime.now()).total_seconds()))
+        refresh_once(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
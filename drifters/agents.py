@@ -0,0 +1,114 @@
+import base64
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# AGENT IMAGES
+# =========================================================
+AGENT_IMAGES = {
+# Duelists
+"jett":"https://media.valorant-api.com/agents/add6443a-41bd-e414-f6ad-e58d267f4e95/displayicon.png",
+"raze":"https://media.valorant-api.com/agents/f94c3b30-42be-e959-889c-5aa313dba261/displayicon.png",
+"reyna":"https://media.valorant-api.com/agents/a3bfb853-43b2-7238-a4f1-ad90e9e46bcc/displayicon.png",
+"phoenix":"https://media.valorant-api.com/agents/eb93336a-449b-9c1b-0a54-a891f7921d69/displayicon.png",
+"yoru":"https://media.valorant-api.com/agents/7f94d92c-4234-0a36-9646-3a87eb8b5c89/displayicon.png",
+"neon":"https://media.valorant-api.com/agents/bb2a4828-46eb-8cd1-e765-15848195d751/displayicon.png",
+"iso":"https://media.valorant-api.com/agents/0e38b510-41a8-5780-5e8f-568b2a4f2d6c/displayicon.png",
+"waylay":"https://media.valorant-api.com/agents/df1cb487-4902-002e-5c17-d28e83e78588/displayicon.png",
+
+# Controllers
+"omen":"https://media.valorant-api.com/agents/8e253930-4c05-31dd-1b6c-968525494517/displayicon.png",
+"brimstone":"https://media.valorant-api.com/agents/9f0d8ba9-4140-b941-57d3-a7ad57c6b417/displayicon.png",
+"viper":"https://media.valorant-api.com/agents/707eab51-4836-f488-046a-cda6bf494859/displayicon.png",
+"astra":"https://media.valorant-api.com/agents/41fb69c1-4189-7b37-f117-bcaf1e96f1bf/displayicon.png",
+"harbor":"https://media.valorant-api.com/agents/95b78ed7-4637-86d9-7e41-71ba8c293152/displayicon.png",
+"clove":"https://media.valorant-api.com/agents/1dbf2edd-4729-0984-3115-daa5eed44993/displayicon.png",
+
+# Initiators
+"sova":"https://media.valorant-api.com/agents/320b2a48-4d9b-a075-30f1-1f93a9b638fa/displayicon.png",
+"breach":"https://media.valorant-api.com/agents/5f8d3a7f-467b-97f3-062c-13acf203c006/displayicon.png",
+"skye":"https://media.valorant-api.com/agents/6f2a04ca-43e0-be17-7f36-b3908627744d/displayicon.png",
+"kay/o":"https://media.valorant-api.com/agents/601dbbe7-43ce-be57-2a40-4abd24953621/displayicon.png",
+"fade":"https://media.valorant-api.com/agents/dade69b4-4f5a-8528-247b-219e5a1facd6/displayicon.png",
+"gekko":"https://media.valorant-api.com/agents/e370fa57-4757-3604-3648-499e1f642d3f/displayicon.png",
+
+# Sentinels
+"sage":"https://media.valorant-api.com/agents/569fdd95-4d10-43ab-ca70-79becc718b46/displayicon.png",
+"cypher":"https://media.valorant-api.com/agents/117ed9e3-49f3-6512-3ccf-0cada7e3823b/displayicon.png",
+"killjoy":"https://media.valorant-api.com/agents/1e58de9c-4950-5125-93e9-a0aee9f98746/displayicon.png",
+"chamber":"https://media.valorant-api.com/agents/22697a3d-45bf-8dd7-4fec-84a9e28c69d7/displayicon.png",
+"vyse":"https://media.valorant-api.com/agents/efba5359-4016-a1e5-7626-b1ae76895940/displayicon.png",
+"deadlock":"https://media.valorant-api.com/agents/cc8b64c8-4b25-4ff9-6e7f-37b4da43d235/displayicon.png"
+}
+
+# =========================================================
+# LOCAL ICON STORE
+#   thumbnails are downloaded once into static/agents/ and served from there,
+#   so rendering never waits on valorant-api.com
+# =========================================================
+
+ICON_DIR = config.ROOT / "static" / "agents"
+ICON_SIZE = 96
+
+def icon_key(agent):
+    if pd.isna(agent): return None
+    return str(agent).lower().strip()
+
+def icon_path(key):
+    return ICON_DIR / f"{key.replace('/', '')}.png"
+
+def icon_file(agent):
+    key = icon_key(agent)
+    if key not in AGENT_IMAGES: return None
+
+    path = icon_path(key)
+    return path if path.exists() else None
+
+def fetch_icon(key):
+    from PIL import Image
+
+    r = requests.get(AGENT_IMAGES[key], timeout=10)
+    r.raise_for_status()
+
+    img = Image.open(io.BytesIO(r.content)).convert("RGBA")
+    img.thumbnail((ICON_SIZE, ICON_SIZE))
+
+    # write then rename, so a half-written file is never served
+    path = icon_path(key)
+    tmp = path.with_suffix(".tmp")
+    img.save(tmp, "PNG", optimize=True)
+    tmp.replace(path)
+
+def fetch_icons(force=False):
+    ICON_DIR.mkdir(parents=True, exist_ok=True)
+    todo = [k for k in AGENT_IMAGES if force or not icon_path(k).exists()]
+    failed = []
+
+    def fetch(key):
+        try:
+            fetch_icon(key)
+        except Exception:
+            logger.warning("agent icon %s unavailable", key, exc_info=True)
+            failed.append(key)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(fetch, todo))
+
+    return {"fetched": len(todo) - len(failed), "failed": failed}
+
+def placeholder(agent):
+    # offline fallback: the agent's initial on a tile, inline so it can't break
+    letter = str(agent).strip()[:1].upper() if icon_key(agent) else "?"
+    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="{ICON_SIZE}" height="{ICON_SIZE}">
+<rect width="100%" height="100%" rx="8" fill="#1f1f26" stroke="#ff4655" stroke-opacity=".5"/>
+<text x="50%" y="50%" dy=".35em" text-anchor="middle" font-family="sans-serif" font-size="44" fill="#ff4655">{letter}</text>
+</svg>"""
+    return f"data:image/svg+xml;base64,{base64.b64encode(svg.encode()).decode()}"
@@ -0,0 +1,301 @@
+import gc
+import io
+import itertools
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import charts, config, data, scoring, store
+
+# =========================================================
+# BENCHMARKS
+#   python -m drifters bench [--players 10,1000,10000] [--history 1000,100000] [--render]
+#   synthetic roster / history / HenrikDev pages, deterministic per seed; nothing hits the network
+# =========================================================
+
+ROLES = list(scoring.ROLE_TARGETS)
+AGENTS = ["Jett", "Omen", "Sova", "Killjoy", "Fade", "Raze", "Viper", "Cypher"]
+DATE_FORMAT = "%d-%m-%Y"
+
+# =========================================================
+# FIXTURES
+# =========================================================
+
+def roster_rows(n, rng):
+    players = np.arange(n)
+    frame = pd.DataFrame({
+        "Date": pd.Timestamp("2026-10-01").strftime(DATE_FORMAT),
+        "Player": [f"Player{i} #T{i}" for i in players],
+        "Role": [ROLES[i % len(ROLES)] for i in players],
+        "Agent": [AGENTS[i % len(AGENTS)] for i in players]
+    })
+
+    for col in scoring.coach_metrics:
+        frame[col] = rng.uniform(4, 10, len(frame)).round(1)
+
+    frame["HS%"] = rng.uniform(10, 35, len(frame)).round(1)
+    frame["ACS"] = rng.uniform(150, 300, len(frame)).round(1)
+    frame["KD"] = rng.uniform(.6, 1.6, len(frame)).round(2)
+
+    return frame
+
+def roster_csv(players, seed=0):
+    # Sheet1 export: one row per player
+    return roster_rows(players, np.random.default_rng(seed)).to_csv(index=False).encode()
+
+def history_csv(rows, players, seed=0):
+    # Data export: one row per player per day, oldest first
+    days = -(-rows // players)
+    dates = pd.date_range(end="2026-10-01", periods=days).strftime(DATE_FORMAT).repeat(players)[:rows]
+
+    frame = roster_rows(rows, np.random.default_rng(seed))
+    frame["Date"] = dates
+    frame["Player"] = [f"Player{i % players} #T{i % players}" for i in range(rows)]
+    frame["Role"] = [ROLES[(i % players) % len(ROLES)] for i in range(rows)]
+
+    return frame.to_csv(index=False).encode()
+
+def match_page(puuid, matches=config.MATCH_WINDOW, seed=0):
+    # v3 /matches page with the same bulk as the real one: 10 players, rounds with kill
+    # and economy events, and a kill feed, most of which a refresh never reads
+    rng = np.random.default_rng(seed)
+    start = int(config.current_act_start()) + 30 * 24 * 3600
+
+    def player(pid):
+        return {
+            "puuid": pid, "name": pid, "tag": "0000", "team": "Red", "character": "Jett",
+            "stats": {
+                "score": 4000, "kills": int(rng.integers(5, 30)), "deaths": int(rng.integers(5, 25)),
+                "assists": int(rng.integers(0, 10)), "headshots": int(rng.integers(5, 20)),
+                "bodyshots": int(rng.integers(20, 60)), "legshots": int(rng.integers(0, 5)),
+                "damage_made": int(rng.integers(1500, 4500))
+            },
+            "ability_casts": {"c_cast": 3, "q_cast": 4, "e_cast": 2, "x_cast": 1},
+            "assets": {"card": {"small": "https://media.valorant-api.com/playercards/" + "0" * 36 + "/smallart.png"}}
+        }
+
+    def round_(players):
+        return {
+            "winning_team": "Red",
+            "plant_events": {"plant_location": {"x": 1, "y": 2}},
+            "player_stats": [{
+                "player_puuid": p,
+                "kill_events": [{
+                    "kill_time_in_round": 1000,
+                    "victim_death_location": {"x": 1, "y": 2},
+                    "player_locations_on_kill": [{"player_puuid": q, "location": {"x": 0, "y": 0}} for q in players]
+                }],
+                "economy": {"loadout_value": 3900, "weapon": {"name": "Vandal"}, "armor": {"name": "Heavy"}}
+            } for p in players]
+        }
+
+    page = []
+    for i in range(matches):
+        players = [puuid] + [f"other-{i}-{j}" for j in range(9)]
+        all_players = [player(p) for p in players]
+        page.append({
+            "metadata": {
+                "matchid": f"{puuid}-m{i}", "map": "Ascent", "game_start": start - i * 3600,
+                "rounds_played": 22, "mode": "Competitive", "queue": "Standard"
+            },
+            "players": {"all_players": all_players, "red": all_players[:5], "blue": all_players[5:]},
+            "rounds": [round_(players) for _ in range(22)],
+            "kills": [{"kill_time_in_match": t, "killer_puuid": players[t % 10]} for t in range(150)]
+        })
+
+    return json.dumps({"status": 200, "data": page}).encode()
+
+class CannedResponse:
+    # enough of requests.Response for store.read_matches, streamed or not
+    def __init__(self, body):
+        self.body = body
+        self.raw = io.BytesIO(body)
+        self.raw.decode_content = False
+
+    def json(self):
+        return json.loads(self.body)
+
+    def close(self):
+        pass
+
+# =========================================================
+# MEASUREMENT
+# =========================================================
+
+def measure(stage, size, fn, repeat):
+    # median wall time over `repeat` runs, then one traced run for peak Python allocations
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"stage": stage, "size": size, "seconds": round(statistics.median(times), 4), "peak_mb": round(peak / 1e6, 2)}
+
+# =========================================================
+# STAGES
+# =========================================================
+
+def fetch_stages(repeat, fixture=None):
+    body = Path(fixture).read_bytes() if fixture else match_page("bench")
+    puuids = {json.loads(body)["data"][0]["players"]["all_players"][0]["puuid"]} if fixture else {"bench"}
+    size = f"{len(body) / 1e6:.1f} MB page"
+    results = []
+
+    ijson = store.ijson
+    try:
+        store.ijson = None
+        results.append(measure("matches.parse_whole", size, lambda: store.read_matches(CannedResponse(body), puuids), repeat))
+    finally:
+        store.ijson = ijson
+
+    if ijson is not None:
+        results.append(measure("matches.parse_streamed", size, lambda: store.read_matches(CannedResponse(body), puuids), repeat))
+
+    matches = store.read_matches(CannedResponse(body), puuids)
+    puuid = next(iter(puuids))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        match_store = store.MatchStore(Path(tmp) / "bench.db")
+
+        def store_and_summarize():
+            match_store.add(store.match_rows(matches, {puuid}))
+            return match_store.summary(puuid)
+
+        results.append(measure("matches.store_summary", size, store_and_summarize, repeat))
+
+    return results
+
+def roster_stages(players, repeat):
+    body = roster_csv(players)
+    size = f"{players} players"
+
+    df = data.parse_live(body)
+    norm = scoring.score(df)
+
+    return [
+        measure("roster.parse", size, lambda: data.parse_live(body), repeat),
+        measure("roster.score", size, lambda: scoring.score(df), repeat),
+        measure("roster.summary", size, lambda: scoring.player_summary(norm), repeat),
+        measure("roster.roles", size, lambda: scoring.role_players(norm), repeat)
+    ]
+
+def history_stages(rows, players, repeat):
+    body = history_csv(rows, players)
+    size = f"{rows} rows"
+
+    history = data.parse_history(body)
+    player = history["Player"].iloc[-1]
+    rows_for_player = history[history["Player"] == player]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def snapshot_sync():
+            # a fresh snapshot each run, so every month file is written
+            target = Path(tempfile.mkdtemp(dir=tmp))
+            data.HistorySnapshot(target).sync(history)
+
+        snapshot = data.HistorySnapshot(Path(tmp) / "read")
+        snapshot.sync(history)
+
+        # a load after a refresh: the export gains a day, so only the newest month is parsed and
+        # written. Two versions of that day alternate, so every run has a change to write
+        seeded = data.HistorySnapshot(Path(tmp) / "update")
+        seeded.sync_export(body, "seed")
+        last_day = history["Date"].max()
+        day, next_day = (d.strftime(DATE_FORMAT).encode() for d in (last_day, last_day + pd.Timedelta(days=1)))
+        grown = itertools.cycle([
+            body + b"".join(line.replace(day, next_day, 1) + suffix + b"\n" for line in body.splitlines()[-players:])
+            for suffix in (b"", b"1")
+        ])
+
+        return [
+            measure("history.parse", size, lambda: data.parse_history(body), repeat),
+            measure("history.snapshot_sync", size, snapshot_sync, repeat),
+            # a new instance each run: the first read in a process, before any month is in memory
+            measure("history.snapshot_read", size, lambda: data.HistorySnapshot(snapshot.root).read(), repeat),
+            measure("history.snapshot_update", size, lambda: seeded.sync_export(next(grown), "grown"), repeat),
+            measure("history.player_charts", size, lambda: (
+                charts.trend_figure(charts.player_trend(rows_for_player)),
+                charts.breakdown_figure(rows_for_player.tail(10)),
+                charts.act_figure(charts.act_summary(charts.rated_history(rows_for_player), {}))
+            ), repeat)
+        ]
+
+def render_stages(players, rows, repeat):
+    # full page runs through Streamlit's AppTest with the data layer swapped for fixtures
+    from streamlit.testing.v1 import AppTest
+
+    from . import state
+
+    df = data.parse_live(roster_csv(players))
+    history = data.parse_history(history_csv(rows, players))
+    size = f"{players} players / {rows} rows"
+
+    def load():
+        return df, history, "bench"
+    load.clear = lambda: None
+
+    patched = {"load": state.load, "agent_icons": state.agent_icons}
+    cache_db = config.CACHE_DB
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            state.load = load
+            state.agent_icons = lambda: None
+            config.CACHE_DB = Path(tmp) / "bench.db"
+
+            app = AppTest.from_file(str(config.ROOT / "app.py"), default_timeout=600)
+            app.secrets["API_KEY"] = "bench"
+            app.run()
+
+            if app.exception:
+                raise RuntimeError(app.exception[0].value)
+
+            switch = iter(range(1, 10 ** 9))
+
+            return [
+                measure("page.run", size, lambda: app.run(), repeat),
+                measure("page.player_switch", size, lambda: app.selectbox[0].select_index(next(switch) % players).run(), repeat)
+            ]
+        finally:
+            state.load, state.agent_icons = patched["load"], patched["agent_icons"]
+            config.CACHE_DB = cache_db
+
+def run(players=(10, 1000, 10000), history=(1000, 100000), repeat=3, render=False, fixture=None):
+    results = fetch_stages(repeat, fixture)
+
+    for n in players:
+        results += roster_stages(n, repeat)
+
+    for rows in history:
+        results += history_stages(rows, min(players), repeat)
+
+    if render:
+        results += render_stages(min(players), max(history), repeat)
+
+    return results
+
+def report(results):
+    width = max(len(r["stage"]) for r in results)
+    size_width = max(len(r["size"]) for r in results)
+
+    lines = [f"{'stage':<{width}}  {'size':<{size_width}}  {'seconds':>9}  {'peak MB':>8}"]
+    lines += [
+        f"{r['stage']:<{width}}  {r['size']:<{size_width}}  {r['seconds']:>9.4f}  {r['peak_mb']:>8.2f}"
+        for r in results
+    ]
+
+    return "\n".join(lines)
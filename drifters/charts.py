@@ -0,0 +1,283 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from . import config, metrics
+from .scoring import coach_metrics, final_score, rate, stat_metrics
+
+# =========================================================
+# FIGURE CACHE
+# =========================================================
+
+class FigureCache:
+    # (chart, player, data version) -> built figure, bounded LRU shared by every session.
+    # Figures are treated as read-only once cached.
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.figures = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key, build):
+        chart = str(key[0]).split(":")[0]
+
+        with self.lock:
+            if key in self.figures:
+                self.figures.move_to_end(key)
+                self.hits += 1
+                metrics.count("figure_cache", chart=chart, result="hit")
+                return self.figures[key]
+
+        with metrics.timer("figure_build", chart=chart):
+            fig = build()
+
+        metrics.count("figure_cache", chart=chart, result="miss")
+
+        with self.lock:
+            self.misses += 1
+            self.figures[key] = fig
+            self.figures.move_to_end(key)
+            while len(self.figures) > self.size:
+                self.figures.popitem(last=False)
+
+        return fig
+
+# =========================================================
+# GAUGE
+# =========================================================
+
+def gauge(title,value):
+    fig=go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=float(value),
+        number={'suffix':" /10",'font':{'size':40}},
+        title={'text':title,'font':{'size': 20,'color':'#ff4655'}},
+        gauge={'axis':{'range':[0,10]},'bar':{'color':'#ff4655'}}
+    ))
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)",height=300)
+    return fig
+
+# ==========================
+# PERFORMANCE TREND
+# ==========================
+
+def rated_history(rows):
+    trend = rows.copy()
+    coach_cols = ["Aim","Utility","Comms","Entry","Clutch"]
+
+    for c in coach_cols:
+        if c in trend.columns:
+            trend[c] = pd.to_numeric(trend[c], errors="coerce")
+
+    # calculate normalized scores same as main system
+    trend = trend.join(rate(trend, stat_metrics).rename(columns={"HS%":"HS_score","ACS":"ACS_score","KD":"KD_score"}))
+    trend[coach_metrics] = rate(trend, coach_metrics)[coach_metrics]
+
+    trend["CoachScore"] = trend[coach_metrics].mean(axis=1)
+    trend["StatScore"] = trend[["HS_score","ACS_score","KD_score"]].mean(axis=1)
+
+    trend["Overall"] = final_score(trend)
+
+    return trend.sort_values("Date")
+
+def player_trend(rows):
+    return rated_history(rows).tail(10)
+
+def trend_figure(trend):
+    fig_trend = px.line(
+        trend,
+        x="Date",
+        y="Overall",
+        markers=True,
+        line_shape="spline",
+        title="Performance Trend"
+    )
+
+    fig_trend.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        yaxis=dict(range=[0,10])
+    )
+
+    return fig_trend
+
+# ==========================
+# COACH METRICS / MECHANICAL STATS
+# ==========================
+
+def metric_bars(values, label, title):
+    fig = px.bar(
+        x=values.index,
+        y=values.values,
+        labels={"x":label,"y":"Score"},
+        title=title
+    )
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        yaxis=dict(range=[0,10])
+    )
+
+    return fig
+
+def coach_figure(pn):
+    return metric_bars(pn[coach_metrics].mean(), "Metric", "Coach Metrics")
+
+def mech_figure(pn):
+    return metric_bars(pn[stat_metrics].mean(), "Stat", "Mechanical Stats")
+
+# ==========================
+# PLAYER RADAR CHART
+# ==========================
+
+def radar_figure(pn):
+    radar_metrics = coach_metrics + stat_metrics
+
+    radar_values = pn[radar_metrics].mean()
+
+    fig_radar = go.Figure()
+
+    fig_radar.add_trace(go.Scatterpolar(
+        r=radar_values.values,
+        theta=radar_metrics,
+        fill="toself",
+        line_color="#ff4655"
+    ))
+
+    fig_radar.update_layout(
+        polar=dict(radialaxis=dict(visible=True,range=[0,10])),
+        showlegend=False,
+        paper_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        title="Player Radar"
+    )
+
+    return fig_radar
+
+# ==========================
+# ROLE COMPARISON
+# ==========================
+
+def role_figure(roles):
+    # roles: scoring.role_players(); the mean over every rated roster row in the role
+    totals = roles.assign(Total=roles["Overall"].fillna(0) * roles["Rows"]).groupby("Role")[["Total", "Rows"]].sum()
+    role_avg = (totals["Total"] / totals["Rows"]).rename("Overall").reset_index()
+
+    fig_role = px.bar(
+        role_avg,
+        x="Role",
+        y="Overall",
+        title="Role Performance (Average performance of all players in the role)",
+        color="Overall",
+        color_continuous_scale="Reds"
+    )
+
+    fig_role.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        yaxis=dict(range=[0,10])
+    )
+
+    return fig_role
+
+# ==========================
+# ACT COMPARISON
+# ==========================
+
+def act_labels(dates):
+    # history dates are UTC days; anything before the first configured act is "Earlier"
+    acts = config.act_starts()
+    bins = [pd.Timestamp.min] + [pd.Timestamp(start, unit="s") for _, start in acts] + [pd.Timestamp.max]
+
+    return pd.cut(dates, bins=bins, labels=["Earlier"] + [name for name, _ in acts], right=False)
+
+def act_summary(rated, match_stats):
+    # Overall: mean of the daily ratings dated in each act. Games / KD / ACS / HS%: every
+    # competitive match of the act in the match store (henrik.act_stats); blank without any.
+    acts = rated.assign(Act=act_labels(rated["Date"])).dropna(subset=["Act", "Overall"])
+
+    overall = acts.groupby("Act", observed=True).agg(
+        Days=("Overall", "size"),
+        Overall=("Overall", "mean")
+    )
+    overall.index = overall.index.astype(str)
+
+    stats = pd.DataFrame.from_dict(match_stats, orient="index", columns=["Games", "KD", "ACS", "HS%"])
+
+    return overall.join(stats).round(2).rename_axis("Act").reset_index()
+
+def act_figure(acts):
+    fig_acts = px.bar(
+        acts,
+        x="Act",
+        y="Overall",
+        title="Overall by Act",
+        color="Overall",
+        color_continuous_scale="Reds"
+    )
+
+    fig_acts.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        yaxis=dict(range=[0,10])
+    )
+
+    return fig_acts
+
+# =========================================================
+# PERFORMANCE BREAKDOWN
+# =========================================================
+
+def breakdown_figure(plot):
+    # ===============================
+    # NORMALIZE STATS TO 0-10 SCALE
+    # ===============================
+    plot = plot.join(rate(plot, stat_metrics).rename(columns={"HS%":"HS_norm","ACS":"ACS_norm","KD":"KD_norm"}))
+
+    metrics_for_graph = [
+        "Aim","Utility","Comms","Entry","Clutch",
+        "HS_norm","ACS_norm","KD_norm"
+    ]
+
+    existing = [m for m in metrics_for_graph if m in plot.columns]
+
+    long = plot.melt(
+        id_vars="Date",
+        value_vars=existing,
+        var_name="Metric",
+        value_name="Score"
+    ).dropna()
+
+    # clean names
+    long["Metric"] = long["Metric"].replace({
+        "HS_norm":"HS%",
+        "ACS_norm":"ACS",
+        "KD_norm":"KD"
+    })
+
+    fig = px.line(
+        long,
+        x="Date",
+        y="Score",
+        color="Metric",
+        markers=True,
+        line_shape="spline"
+    )
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        yaxis=dict(range=[0,10], title="Performance Score"),
+        legend_title="Metric"
+    )
+
+    return fig
@@ -0,0 +1,116 @@
+import functools
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10, streamlit ships `toml`
+    import toml as tomllib
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# =========================================================
+# SHEETS
+# =========================================================
+SPREADSHEET_KEY = "1p5u4T--HBuZhsoFBUoZmLnYH7Qvk8m7Ts7flv7xVCW0"
+SHEET_URL = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_KEY}/export?format=csv&gid=0"
+HISTORY_URL = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_KEY}/gviz/tq?tqx=out:csv&sheet=Data"
+
+# =========================================================
+# HENRIKDEV
+# =========================================================
+
+# refresh concurrency (the quota itself is the HENRIK_RATE_LIMIT secret, requests per minute)
+REFRESH_WORKERS = 4
+
+# HenrikDev HTTP client: per-request timeout (s), retries, and base backoff (s)
+HENRIK_TIMEOUT = 15
+HENRIK_RETRIES = 4
+HENRIK_BACKOFF = 2
+
+# local cache for Riot ID -> (puuid, region) lookups, match store and refresh jobs
+CACHE_DB = ROOT / "tracker_cache.db"
+ACCOUNT_CACHE_TTL = 7 * 24 * 3600
+
+# matches used for the rolling stats, and the page size used to look for new ones
+MATCH_WINDOW = 20
+MATCH_PROBE_SIZE = 5
+
+# =========================================================
+# ACTS
+# =========================================================
+
+# (name, start in UTC), oldest first; add a line when a new act starts.
+# Stats are computed over the current act only, and history is grouped by act.
+ACTS = [
+    ("V26 A2", "2026-03-18 21:00:00"),
+]
+
+def act_starts():
+    # [(name, unix start)] sorted by start
+    return sorted(
+        ((name, datetime.fromisoformat(start).replace(tzinfo=timezone.utc).timestamp()) for name, start in ACTS),
+        key=lambda act: act[1]
+    )
+
+def current_act_start(now=None):
+    now = time.time() if now is None else now
+    started = [start for _, start in act_starts() if start <= now]
+    return started[-1] if started else 0
+
+# =========================================================
+# DASHBOARD
+# =========================================================
+
+# typed Parquet copy of the Data sheet, one file per month, re-synced whenever the sheet export changes
+HISTORY_SNAPSHOT = ROOT / "history_snapshot"
+
+# built Plotly figures kept per process, least recently used evicted first
+FIGURE_CACHE_SIZE = 256
+
+# =========================================================
+# PROCESS SINGLETONS
+# =========================================================
+
+def singleton(build):
+    # functools.cache for zero-argument accessors, but built under a lock: the first calls
+    # often come from several refresh workers at once, and each must get the same object
+    cached = functools.cache(build)
+    lock = threading.RLock()
+
+    @functools.wraps(build)
+    def get():
+        with lock:
+            return cached()
+
+    get.cache_clear = cached.cache_clear
+    return get
+
+# =========================================================
+# SECRETS
+# =========================================================
+SECRETS_PATH = ROOT / ".streamlit" / "secrets.toml"
+
+_secrets = None
+
+def use_secrets(secrets):
+    # the dashboard hands over st.secrets; headless runs read secrets.toml / env
+    global _secrets
+    _secrets = secrets
+
+def secrets():
+    global _secrets
+
+    if _secrets is None:
+        _secrets = tomllib.loads(SECRETS_PATH.read_text()) if SECRETS_PATH.exists() else {}
+
+    return _secrets
+
+def secret(key, default=None):
+    if key in os.environ:
+        return os.environ[key]
+    return secrets().get(key, default)
@@ -0,0 +1,288 @@
+import hashlib
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet
+import requests
+
+from . import config, metrics
+
+# =========================================================
+# DATA
+# =========================================================
+
+def clean_riot_id(player):
+
+    if pd.isna(player):
+        return None
+
+    player = str(player)
+
+    # remove weird unicode spaces
+    player = player.replace("\xa0", " ")
+
+    # normalize spacing
+    player = " ".join(player.split())
+
+    # remove space before #
+    player = player.replace(" #", "#")
+
+    return player.strip()
+
+def fetch_sheet_csv(url, cache):
+    cached = cache.get(url)
+    headers = {}
+
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["modified"]:
+        headers["If-Modified-Since"] = cached["modified"]
+
+    sheet = "Data" if url == config.HISTORY_URL else "Sheet1"
+
+    with metrics.timer("sheet_export", sheet=sheet):
+        r = requests.get(url, headers=headers, timeout=30)
+
+    metrics.count("sheet_export_responses", sheet=sheet, status=str(r.status_code))
+
+    if r.status_code == 304 and cached:
+        return cached
+
+    r.raise_for_status()
+
+    cache[url] = {
+        "etag": r.headers.get("ETag"),
+        "modified": r.headers.get("Last-Modified"),
+        "body": r.content,
+        "digest": hashlib.sha1(r.content).hexdigest()
+    }
+    return cache[url]
+
+def fetch_exports(cache):
+    # Sheet1 and Data exports in parallel, conditional on what the cache already has
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        live, history = pool.map(lambda url: fetch_sheet_csv(url, cache), [config.SHEET_URL, config.HISTORY_URL])
+
+    return live, history
+
+def parse_live(body):
+    # ---- LIVE DATA (Sheet1)
+    df = pd.read_csv(io.BytesIO(body))
+    df.columns = df.columns.str.strip()
+
+    df = df[df["Player"].notna()]
+    df = df[df["Player"].astype(str).str.contains("#")]
+    df["Player"] = df["Player"].apply(clean_riot_id)
+
+    df["Date"] = pd.to_datetime(
+        df["Date"],
+        errors="coerce",
+        dayfirst=True
+    )
+
+    # safe numeric conversion
+    for col in df.columns:
+        if col not in ["Date","Player","Role","Agent"]:
+            df[col]=pd.to_numeric(df[col],errors="coerce")
+
+    return df.sort_values("Date")
+
+TEXT_COLUMNS = ["Player","Role","Agent"]
+
+def type_history(history):
+    history.columns = history.columns.str.strip()
+    history["Player"] = history["Player"].apply(clean_riot_id)
+    history["Date"] = pd.to_datetime(history["Date"], errors="coerce", dayfirst=True)
+
+    for col in history.columns:
+        if col != "Date" and col not in TEXT_COLUMNS:
+            history[col] = pd.to_numeric(history[col], errors="coerce")
+
+    return history.sort_values("Date", kind="stable")
+
+def parse_history(body):
+    # ---- HISTORY DATA (Data sheet)
+    return type_history(pd.read_csv(io.BytesIO(body)))
+
+def history_frame(rows):
+    # Data sheet values (header first, as gspread returns them) -> typed history
+    header = rows[0]
+    body = [(list(r) + [""] * len(header))[:len(header)] for r in rows[1:]]
+
+    return type_history(pd.DataFrame(body, columns=header, dtype=object).replace("", None))
+
+# =========================================================
+# HISTORY SNAPSHOT
+#   history_snapshot/<month>.parquet + _manifest.json (month -> content digest)
+#   + _source.json (the Data export the files match, and the part of it that can be skipped).
+#   sync() rewrites only the months whose rows changed, so a refresh touches the current month.
+#   Months rather than days keep the file count (and read time) low as history grows.
+# =========================================================
+
+def month_keys(history):
+    return history["Date"].dt.strftime("%Y-%m").fillna("undated")
+
+def export_prefix(body, start, history, months):
+    # {bytes, digest, months}: the export up to the trailing run of its newest month's rows.
+    # An export that still starts with those bytes only needs the rows after them parsed.
+    # history: parsed from the rows from byte `start` on; months: those of the rows before it
+    if not len(history):
+        return None
+
+    ends = np.flatnonzero(np.frombuffer(body, np.uint8, offset=start) == ord("\n")) + start + 1
+    starts = np.concatenate([[start], ends[ends < len(body)]])
+
+    # a quoted newline or a blank line: rows can't be told apart by line
+    if len(starts) != len(history):
+        return None
+
+    keys = month_keys(history).sort_index().reset_index(drop=True)
+    first = {key: row for row, key in keys.drop_duplicates().items()}
+
+    # back to the first row of every month at or after it, so no month is split across the cut
+    # (rows out of date order move it further up)
+    run = first[keys.iloc[-1]]
+    while (earliest := min(first[key] for key in set(keys.iloc[run:]))) < run:
+        run = earliest
+
+    offset = int(starts[run])
+    before = set(months) | set(keys.iloc[:run])
+    return {"bytes": offset, "digest": hashlib.sha1(body[:offset]).hexdigest(), "months": sorted(before)}
+
+class HistorySnapshot:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.manifest = self.root / "_manifest.json"
+        self.source_file = self.root / "_source.json"
+        self.frames = {}
+        self.lock = threading.Lock()
+
+    def parts(self):
+        return json.loads(self.manifest.read_text()) if self.manifest.exists() else None
+
+    def source(self):
+        # {digest: Data export the files match, or None after a refresh wrote them; prefix: export_prefix()}
+        if self.source_file.exists():
+            return json.loads(self.source_file.read_text())
+        return {"digest": None, "prefix": None}
+
+    def version(self):
+        # changes whenever any month file is rewritten; None until the first sync
+        return hashlib.sha1(self.manifest.read_bytes()).hexdigest() if self.manifest.exists() else None
+
+    def schema(self, history):
+        return pa.schema([
+            (col, pa.timestamp("ns") if col == "Date" else pa.string() if col in TEXT_COLUMNS else pa.float64())
+            for col in history.columns
+        ])
+
+    def read(self):
+        # month tables are kept in memory by digest, so after a sync only the rewritten files are read
+        parts = self.parts()
+        if not parts:
+            return None
+
+        with self.lock:
+            self.frames = {
+                key: self.frames[key] if self.frames.get(key, (None,))[0] == digest
+                else (digest, pa.parquet.read_table(self.root / f"{key}.parquet"))
+                for key, digest in sorted(parts.items())
+            }
+            history = pa.concat_tables([table for _, table in self.frames.values()]).to_pandas()
+
+        return history.sort_values("Date", kind="stable").reset_index(drop=True)
+
+    def read_month(self, month):
+        if month not in (self.parts() or {}):
+            return None
+        return pd.read_parquet(self.root / f"{month}.parquet")
+
+    def conform(self, history):
+        # the dtypes the files hold, so a frame read back from the snapshot digests like a parsed one;
+        # "string" keeps missing text as <NA> on every pandas version ("str" turns it into "nan" before 3.0)
+        return history.astype({
+            col: "datetime64[ns]" if col == "Date" else "string" if col in TEXT_COLUMNS else "float64"
+            for col in history.columns
+        })
+
+    def sync_export(self, body, digest):
+        # fold a Data export into the snapshot. While the sheet only changes at the end (refreshes
+        # append and overwrite today's rows), only the newest month's rows are parsed and compared.
+        # Returns how many month files were written.
+        prefix = self.source()["prefix"]
+        header = body[:body.find(b"\n") + 1]
+
+        if (
+            prefix
+            and set(prefix["months"]) <= (self.parts() or {}).keys()
+            and hashlib.sha1(body[:prefix["bytes"]]).hexdigest() == prefix["digest"]
+        ):
+            tail = parse_history(header + body[prefix["bytes"]:])
+
+            if not set(month_keys(tail)) & set(prefix["months"]):
+                source = {"digest": digest, "prefix": export_prefix(body, prefix["bytes"], tail, prefix["months"])}
+                return self.sync(tail, source, keep=prefix["months"])
+
+        # first sync, or rows changed further up: the whole export
+        history = parse_history(body)
+        return self.sync(history, {"digest": digest, "prefix": export_prefix(body, len(header), history, [])})
+
+    def sync(self, history, source=None, keep=()):
+        # history: typed frame (type_history), without the months in `keep`, which are left as they are.
+        # source: what the files now match (see source()); None when a refresh wrote them, which
+        # keeps the old prefix as long as none of its months changed.
+        # Returns how many month files were written.
+        history = self.conform(history)
+        month = month_keys(history)
+        schema = self.schema(history)
+        written = 0
+
+        with self.lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            old = self.parts() or {}
+            new = {key: old[key] for key in keep}
+            changed = set()
+
+            for key, part in history.groupby(month, sort=False):
+                digest = hashlib.sha1(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes()).hexdigest()
+                digest = hashlib.sha1((digest + ",".join(part.columns)).encode()).hexdigest()
+                new[key] = digest
+
+                if old.get(key) == digest:
+                    continue
+
+                # write then rename, so readers never see a half-written month
+                tmp = self.root / f".{key}.parquet.tmp"
+                pa.parquet.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False), tmp)
+                tmp.replace(self.root / f"{key}.parquet")
+                changed.add(key)
+                written += 1
+
+            for key in old.keys() - new.keys():
+                (self.root / f"{key}.parquet").unlink(missing_ok=True)
+                changed.add(key)
+
+            if changed:
+                tmp = self.root / "._manifest.json.tmp"
+                tmp.write_text(json.dumps(new, sort_keys=True))
+                tmp.replace(self.manifest)
+
+            if source is None:
+                prefix = self.source()["prefix"]
+                source = {"digest": None, "prefix": prefix if prefix and not changed & set(prefix["months"]) else None}
+
+            tmp = self.root / "._source.json.tmp"
+            tmp.write_text(json.dumps(source))
+            tmp.replace(self.source_file)
+
+        return written
+
+@config.singleton
+def history_snapshot():
+    return HistorySnapshot(config.HISTORY_SNAPSHOT)
@@ -0,0 +1,292 @@
+import email.utils
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from . import config, metrics
+from .store import account_cache, match_rows, match_store, read_matches
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# RATE LIMITER
+# =========================================================
+
+class TokenBucket:
+    # refills `rate` tokens every `per` seconds, holds at most `burst`
+    def __init__(self, rate, per=60, burst=1):
+        self.capacity = burst
+        self.tokens = burst
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds):
+        # hold every caller back, e.g. after the API answered 429
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.updated = self.blocked_until
+            self.tokens = 0
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                    reason = "cooldown"
+                else:
+                    reason = "quota"
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                    self.updated = now
+
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+
+                    wait = (1 - self.tokens) / self.fill_rate
+
+            metrics.count("henrik_wait_seconds", wait, reason=reason)
+            time.sleep(wait)
+
+@config.singleton
+def henrik_limiter():
+    # one bucket per process: the quota belongs to the API key, not the session
+    return TokenBucket(int(config.secret("HENRIK_RATE_LIMIT", 30)), per=60)
+
+# =========================================================
+# HENRIKDEV CLIENT
+# =========================================================
+
+@config.singleton
+def henrik_session():
+    # keep-alive pool shared by the refresh workers
+    session = requests.Session()
+    session.headers["Authorization"] = config.secret("API_KEY")
+
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=config.REFRESH_WORKERS)
+    session.mount("https://", adapter)
+
+    return session
+
+def retry_after(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def endpoint(url):
+    # metric label: /v1/account/... -> account, /v3/by-puuid/matches/... -> matches
+    return "account" if "/account/" in url else "matches"
+
+def henrik_get(url, stream=False):
+    # throttles and 5xx are retried with backoff instead of dropping the player
+    label = endpoint(url)
+
+    for attempt in range(config.HENRIK_RETRIES + 1):
+        backoff = config.HENRIK_BACKOFF * 2 ** attempt
+        henrik_limiter().acquire()
+
+        try:
+            with metrics.timer("henrik_request", endpoint=label):
+                r = henrik_session().get(url, timeout=config.HENRIK_TIMEOUT, stream=stream)
+        except (requests.ConnectionError, requests.Timeout):
+            metrics.count("henrik_responses", endpoint=label, status="error")
+            if attempt == config.HENRIK_RETRIES:
+                raise
+            metrics.count("henrik_wait_seconds", backoff, reason="backoff")
+            time.sleep(backoff)
+            continue
+
+        metrics.count("henrik_responses", endpoint=label, status=str(r.status_code))
+
+        if r.status_code != 429 and r.status_code < 500:
+            return r
+
+        if attempt == config.HENRIK_RETRIES:
+            return r
+
+        wait = retry_after(r) or backoff
+        r.close()
+
+        if r.status_code == 429:
+            # the quota is shared, so every worker waits it out
+            henrik_limiter().pause(wait)
+        else:
+            metrics.count("henrik_wait_seconds", wait, reason="backoff")
+            time.sleep(wait)
+
+# =========================================================
+# TRACKER DATA
+# =========================================================
+
+def resolve_account(name, tag):
+
+    # ---------- GET REGION ----------
+    acc_url = f"https://api.henrikdev.xyz/valorant/v1/account/{name}/{tag}"
+    acc = henrik_get(acc_url)
+
+    if acc.status_code != 200:
+        return None
+
+    account = acc.json()["data"]
+
+    # ===== REGION FIX =====
+    region_raw = str(account.get("region","")).lower()
+
+    REGION_MAP = {
+        "ap": "ap",
+        "eu": "eu",
+        "na": "na",
+        "kr": "kr",
+        "latam": "latam",
+        "br": "br"
+    }
+
+    region = REGION_MAP.get(region_raw, "ap")
+
+    return account["puuid"], region
+
+def riot_key(riot_id):
+    # account cache key: "Name #TAG" and "name#tag" are the same account
+    name, tag = riot_id.split("#")
+    return f"{name.strip().lower()}#{tag.strip().lower()}"
+
+def lookup_account(riot_id):
+    # -> (riot_key, (puuid, region) or None, came from the cache)
+    key = riot_key(riot_id)
+    name, tag = key.split("#")
+    cache = account_cache()
+
+    cached = cache.get(key)
+    account = cached or resolve_account(name, tag)
+
+    # a stale cached account shows up as a 404 on the matches call, which invalidates it there
+    if account is not None and cached is None:
+        cache.put(key, *account)
+
+    return key, account, cached is not None
+
+class RosterPlan:
+    # one refresh across the roster: stats for every roster player in a match are stored
+    # from the first page it is extracted from. Every player's page is still downloaded and
+    # decoded; what is saved is the per-match row extraction and the store writes.
+    def __init__(self, puuids):
+        self.puuids = set(puuids)
+        self.seen = set()
+        self.walked = set()
+        self.lock = threading.Lock()
+
+    def record(self, matches, new):
+        # matches: the current-act part of one player's page; new: those the store lacks for that player.
+        # Only extracted matches count as walked: a match another player already had stored
+        # says nothing about whether this player's row is in the store.
+        with self.lock:
+            shared = sum(m["metadata"]["matchid"] in self.seen for m in matches)
+            fresh = [m for m in new if m["metadata"]["matchid"] not in self.walked]
+
+            metrics.count("matches_shared", shared)
+            metrics.count("matches_walked", len(fresh))
+
+            self.seen.update(m["metadata"]["matchid"] for m in matches)
+            self.walked.update(m["metadata"]["matchid"] for m in fresh)
+            match_store().add(match_rows(fresh, self.puuids))
+
+@metrics.timed("fetch_tracker_stats")
+def fetch_tracker_stats(riot_id, account=None, plan=None):
+
+    try:
+        riot_key, account, cached = account or lookup_account(riot_id)
+
+        if account is None:
+            return None
+
+        player_puuid, region = account
+        plan = plan or RosterPlan([player_puuid])
+
+        # ---------- GET MATCHES (ONLY WHAT THE STORE IS MISSING, CURRENT ACT ONLY) ----------
+        store = match_store()
+        watermark = store.watermark(player_puuid)
+        size = config.MATCH_PROBE_SIZE if watermark is not None else config.MATCH_WINDOW
+        act_start = config.current_act_start()
+
+        while True:
+            url = f"https://api.henrikdev.xyz/valorant/v3/by-puuid/matches/{region}/{player_puuid}?mode=competitive&size={size}"
+            r = henrik_get(url, stream=True)
+
+            if r.status_code != 200:
+                r.close()
+                if cached and r.status_code == 404:
+                    # stale puuid/region, resolve the account again next refresh
+                    account_cache().invalidate(riot_key)
+                return None
+
+            matches = read_matches(r, plan.puuids)
+            current = [m for m in matches if m["metadata"].get("game_start", 0) >= act_start]
+            new_matches = store.new_matches(player_puuid, current)
+
+            # the probe reached the last sync, reached the previous act, or there is nothing older: done
+            reached = watermark is not None and any(m["metadata"].get("game_start", 0) <= watermark for m in matches)
+            if size == config.MATCH_WINDOW or reached or len(current) < len(matches) or len(matches) < size:
+                break
+
+            size = config.MATCH_WINDOW
+
+        plan.record(current, new_matches)
+
+        if matches:
+            store.mark_synced(player_puuid, max(m["metadata"].get("game_start", 0) for m in matches))
+
+        return store.summary(player_puuid, since=act_start)
+
+    except Exception:
+        logger.exception("stats fetch failed for %s", riot_id)
+        return None
+
+def act_stats(riot_id):
+    # per-act Games / KD / ACS / HS% from the local match store; empty until the player's
+    # first refresh on this host
+    if "#" not in riot_id:
+        return {}
+
+    puuid = account_cache().puuid(riot_key(riot_id))
+    if puuid is None:
+        return {}
+
+    return match_store().act_summaries(puuid, [("Earlier", 0)] + config.act_starts())
+
+def safe_lookup(riot_id):
+    try:
+        return lookup_account(riot_id)
+    except Exception:
+        logger.exception("account lookup failed for %s", riot_id)
+        return None, None, False
+
+def refresh_roster(riot_ids, workers=config.REFRESH_WORKERS):
+    # accounts first, so every matches page can be mined for the whole roster;
+    # then players concurrently, pacing is left to the shared token bucket
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        accounts = dict(zip(riot_ids, pool.map(safe_lookup, riot_ids)))
+        plan = RosterPlan(account[0] for _, account, _ in accounts.values() if account)
+
+        futures = {
+            pool.submit(fetch_tracker_stats, riot_id, accounts[riot_id], plan): riot_id
+            for riot_id in riot_ids
+        }
+
+        for future in as_completed(futures):
+            yield futures[future], future.result()
@@ -0,0 +1,146 @@
+import contextlib
+import functools
+import logging
+import threading
+import time
+from pathlib import Path
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# METRICS
+#   process-wide counters and timers, rendered in the Prometheus text format.
+#   Written to the METRICS_FILE secret (e.g. a node_exporter textfile collector path)
+#   after every refresh, and shown in the dashboard's admin panel (?admin=1).
+# =========================================================
+
+PREFIX = "drifters"
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.timers = {}
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            count, total, peak = self.timers.get(key, (0, 0.0, 0.0))
+            self.timers[key] = (count + 1, total + seconds, max(peak, seconds))
+
+    @contextlib.contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name, **labels):
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def rows(self):
+        # flat view for the admin panel
+        with self.lock:
+            counters = dict(self.counters)
+            timers = dict(self.timers)
+
+        rows = [
+            {"metric": name, "labels": format_labels(labels), "count": round(value, 3), "total_s": None, "mean_ms": None, "max_ms": None}
+            for (name, labels), value in sorted(counters.items())
+        ]
+        rows += [
+            {"metric": name, "labels": format_labels(labels), "count": count, "total_s": round(total, 3),
+             "mean_ms": round(total / count * 1000, 1), "max_ms": round(peak * 1000, 1)}
+            for (name, labels), (count, total, peak) in sorted(timers.items())
+        ]
+        return rows
+
+    def value(self, name, **labels):
+        # counter total, summed over every label set matching `labels`
+        with self.lock:
+            return sum(v for (n, l), v in self.counters.items() if n == name and set(labels.items()) <= set(l))
+
+    def calls(self, name, **labels):
+        # timer observations, summed the same way
+        with self.lock:
+            return sum(v[0] for (n, l), v in self.timers.items() if n == name and set(labels.items()) <= set(l))
+
+    def render(self):
+        with self.lock:
+            counters = dict(self.counters)
+            timers = dict(self.timers)
+
+        lines = []
+
+        for metric in sorted({name for name, _ in counters}):
+            lines.append(f"# TYPE {PREFIX}_{metric}_total counter")
+            lines += [
+                f"{PREFIX}_{metric}_total{prom_labels(labels)} {round(value, 6)}"
+                for (name, labels), value in sorted(counters.items()) if name == metric
+            ]
+
+        for metric in sorted({name for name, _ in timers}):
+            lines.append(f"# TYPE {PREFIX}_{metric}_seconds summary")
+            for (name, labels), (count, total, peak) in sorted(timers.items()):
+                if name == metric:
+                    lines.append(f"{PREFIX}_{metric}_seconds_count{prom_labels(labels)} {count}")
+                    lines.append(f"{PREFIX}_{metric}_seconds_sum{prom_labels(labels)} {total:.6f}")
+
+            lines.append(f"# TYPE {PREFIX}_{metric}_seconds_max gauge")
+            lines += [
+                f"{PREFIX}_{metric}_seconds_max{prom_labels(labels)} {peak:.6f}"
+                for (name, labels), (_, _, peak) in sorted(timers.items()) if name == metric
+            ]
+
+        return "\n".join(lines) + "\n"
+
+def format_labels(labels):
+    return ", ".join(f"{k}={v}" for k, v in labels)
+
+def prom_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+REGISTRY = Registry()
+
+count = REGISTRY.count
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+
+_write_lock = threading.Lock()
+
+def write(path=None):
+    # atomic, so a scraper never reads half a file; no-op unless a path is configured
+    path = path or config.secret("METRICS_FILE")
+    if not path:
+        return None
+
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+
+    try:
+        with _write_lock:
+            tmp.write_text(REGISTRY.render())
+            tmp.replace(path)
+    except OSError:
+        logger.warning("could not write metrics to %s", path, exc_info=True)
+        return None
+
+    return path
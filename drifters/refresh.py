@@ -0,0 +1,379 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from . import data, metrics, scoring
+from .henrik import refresh_roster
+from .sheets import gateway, sheets_call
+from .store import history_index
+
+logger = logging.getLogger(__name__)
+
+HISTORY_COLUMNS = ["Date", "Player", "Role", "Agent", "Aim", "Utility", "Comms", "Entry", "Clutch"]
+
+# Sheet1 columns J:L
+STAT_COLUMNS = slice(9, 12)
+
+def same_values(cells, values):
+    # cells come back from get_all_values() formatted ("25", "1.07"); compare as numbers where both parse
+    cells = list(cells)
+
+    if len(cells) != len(values):
+        return False
+
+    for cell, value in zip(cells, values):
+        try:
+            if abs(float(cell) - float(value)) > 1e-9:
+                return False
+        except (TypeError, ValueError):
+            if str(cell) != str(value):
+                return False
+
+    return True
+
+def appended_rows(response):
+    # row numbers Sheets actually used for an append_rows() call ("Data!A120:L125" -> 120..125)
+    try:
+        cells = response["updates"]["updatedRange"].split("!")[-1]
+        first, last = (int("".join(c for c in part if c.isdigit())) for part in cells.split(":"))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return range(first, last + 1)
+
+# =========================================================
+# HISTORY ROWS
+#   the Data sheet is read through the local row index: Sheet1, the Data header, the
+#   sheet's last row and today's rows, in one batch. Anything off (rows inserted, deleted
+#   or sorted by hand) means one full read that rebuilds the index.
+# =========================================================
+
+def read_rows(sheets, today):
+    # -> Sheet1 rows, Data header, {Riot ID: (row number, cells)} for today, whole Data sheet or None
+    index = history_index()
+    extent = index.extent()
+    known = index.rows(today)
+
+    if extent is not None:
+        sheet_rows, header, tail, *cells = sheets.read(
+            sheets.range(sheets.sheet),
+            sheets.range(sheets.data, "1:1"),
+            sheets.range(sheets.data, f"{extent}:{extent + 1}"),
+            *(sheets.range(sheets.data, f"{row}:{row}") for row in known.values())
+        )
+        cells = [c[0] if c else [] for c in cells]
+
+        in_place = len(tail) == 1 and any(tail[0]) and all(
+            c[:2] == [today, riot_id] for riot_id, c in zip(known, cells)
+        )
+
+        if header and in_place:
+            return sheet_rows, header[0], dict(zip(known, zip(known.values(), cells))), None
+
+        logger.info("history index out of date, re-reading the Data sheet")
+
+    sheet_rows, history_rows = sheets.read(sheets.range(sheets.sheet), sheets.range(sheets.data))
+    index.rebuild(history_rows)
+    metrics.count("history_index_rebuilds")
+
+    todays = {}
+    for row, cells in enumerate(history_rows[1:], start=2):
+        if len(cells) >= 2 and cells[0] == today:
+            todays[cells[1]] = (row, cells)
+
+    return sheet_rows, history_rows[0], todays, history_rows
+
+# =========================================================
+# REFRESH PIPELINE (SAFE BULK UPDATE)
+# =========================================================
+
+@metrics.timed("refresh")
+def run_refresh(progress=lambda processed, total, riot_id: None, dry_run=False):
+    # fetch every roster player and write Sheet1 + Data; no UI calls, so it can run off the script thread.
+    # dry_run fetches and scores but leaves the spreadsheet untouched.
+
+    sheets = gateway()
+
+    sheet = sheets.sheet
+    data_sheet = sheets.data
+
+    today = pd.Timestamp.today().strftime("%d-%m-%Y")
+
+    # ✅ ONE GOOGLE API READ: SHEET1 + TODAY'S DATA ROWS
+    rows, history_header, todays, history_rows = read_rows(sheets, today)
+
+    header = rows[0]
+    player_col = header.index("Player")
+
+    batch_updates = []
+    history_updates = []
+    history_appends = []
+    unchanged = 0
+    missing = []
+    refreshed = []
+    updated = 0
+    processed = 0
+
+    roster = []
+
+    for sheet_row, row in enumerate(rows[1:], start=2):
+
+        if len(row) <= player_col:
+            continue
+
+        riot_id = row[player_col].strip()
+
+        if "#" not in riot_id:
+            continue
+
+        roster.append((sheet_row, row, riot_id))
+
+    # ✅ CONCURRENT FETCH (PACED BY THE HENRIKDEV TOKEN BUCKET)
+    results = {}
+    progress(0, len(roster), None)
+
+    for riot_id, stats in refresh_roster([riot_id for _, _, riot_id in roster]):
+        results[riot_id] = stats
+        processed += 1
+        progress(processed, len(roster), riot_id)
+
+    for sheet_row, row, riot_id in roster:
+
+        stats = results.get(riot_id)
+
+        if not stats:
+            missing.append(riot_id)
+        else:
+            values = [stats["HS%"], stats["ACS"], stats["KD"]]
+
+            # only rows whose numbers moved are written
+            if same_values(row[STAT_COLUMNS], values):
+                unchanged += 1
+            else:
+                batch_updates.append({
+                    "range": f"J{sheet_row}:L{sheet_row}",
+                    "values": [values]
+                })
+        
+            role = row[header.index("Role")]
+            agent = row[header.index("Agent")]
+            
+            player_row_found, cells = todays.get(riot_id, (None, None))
+
+            aim = row[header.index("Aim")]
+            utility = row[header.index("Utility")]
+            comms = row[header.index("Comms")]
+            entry = row[header.index("Entry")]
+            clutch = row[header.index("Clutch")]
+            
+            refreshed.append(dict(zip(HISTORY_COLUMNS, [
+                today, riot_id, role, agent, aim, utility, comms, entry, clutch
+            ]), **stats))
+
+            history_data = [
+                today,
+                riot_id,
+                role,
+                agent,
+                aim,
+                utility,
+                comms,
+                entry,
+                clutch,
+                stats["HS%"],
+                stats["ACS"],
+                stats["KD"]
+            ]
+        
+            if not player_row_found:
+                # append new day entry
+                history_appends.append(history_data)
+            elif not same_values((list(cells) + [""] * len(history_data))[:len(history_data)], history_data):
+                # overwrite today's entry (skipped when it already says this)
+                history_updates.append({
+                    "range": f"A{player_row_found}:L{player_row_found}",
+                    "values": [history_data]
+                })
+        
+            updated += 1
+
+    summary = {
+        "dry_run": dry_run,
+        "processed": processed,
+        "updated": updated,
+        "missing": missing,
+        "writes": {
+            "sheet1_ranges": len(batch_updates),
+            "sheet1_unchanged": unchanged,
+            "history_overwrites": len(history_updates),
+            "history_appends": len(history_appends)
+        },
+        "players": player_scores(refreshed)
+    }
+
+    if dry_run:
+        return summary
+
+    # ✅ ONE GOOGLE API UPDATE
+    if batch_updates:
+        sheets_call("batch_update", sheet.batch_update, batch_updates)
+
+    # ✅ HISTORY: ONE OVERWRITE BATCH + ONE APPEND
+    if history_updates:
+        sheets_call("batch_update", data_sheet.batch_update, history_updates)
+
+    if history_appends:
+        response = sheets_call("append_rows", data_sheet.append_rows, history_appends)
+        appended = appended_rows(response)
+
+        if appended is not None and len(appended) == len(history_appends):
+            history_index().add([(r[0], r[1], row) for r, row in zip(history_appends, appended)])
+        else:
+            history_index().clear()
+
+    summary["writes"]["snapshot_months"] = sync_snapshot(
+        history_header, today, todays, history_rows, history_updates, history_appends
+    )
+
+    return summary
+
+def sync_snapshot(header, today, todays, history_rows, history_updates, history_appends):
+    # mirror what was just written into the local Parquet snapshot, without re-reading the sheet:
+    # the whole sheet when it was read whole, otherwise today's rows over the existing snapshot
+    snapshot = data.history_snapshot()
+    updated = {int(u["range"].split(":")[0][1:]): u["values"][0] for u in history_updates}
+
+    try:
+        if history_rows is not None:
+            rows = [updated.get(i, list(r)) for i, r in enumerate(history_rows, start=1)]
+            return snapshot.sync(data.history_frame(rows + history_appends))
+
+        parts = snapshot.parts()
+        if parts is None:
+            # not seeded yet; the dashboard seeds it from the sheet export on its first load
+            return 0
+
+        rows = [updated.get(row, list(cells)) for row, cells in sorted(todays.values())]
+        fresh = data.history_frame([header] + rows + history_appends)
+        day = pd.to_datetime(today, dayfirst=True)
+        month = day.strftime("%Y-%m")
+
+        # only today's month file is read and rewritten
+        current = snapshot.read_month(month)
+        if current is not None:
+            fresh = pd.concat([current[current["Date"] != day], fresh], ignore_index=True)
+
+        return snapshot.sync(fresh.sort_values("Date", kind="stable").reset_index(drop=True), keep=parts.keys() - {month})
+    except Exception:
+        logger.exception("history snapshot sync failed")
+        return 0
+
+def player_scores(refreshed):
+    # Overall rating each refreshed player would get from today's row
+    if not refreshed:
+        return []
+
+    frame = pd.DataFrame(refreshed)
+    frame[scoring.metrics] = frame[scoring.metrics].apply(pd.to_numeric, errors="coerce")
+    frame["Overall"] = scoring.score(frame)["Overall"].round(2)
+
+    return frame[["Player", "Role", "HS%", "ACS", "KD", "Overall"]].to_dict("records")
+
+
+# =========================================================
+# REFRESH WORKER
+# =========================================================
+
+class RefreshJobs:
+    # job state persisted in SQLite so progress survives reruns and closed tabs
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS refresh_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                status TEXT NOT NULL,
+                requested_at REAL NOT NULL,
+                finished_at REAL,
+                processed INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                current TEXT,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        # jobs from a previous process can't be resumed
+        self.conn.execute(
+            "UPDATE refresh_jobs SET status = 'interrupted', finished_at = ? WHERE status IN ('queued', 'running')",
+            (time.time(),)
+        )
+        self.conn.commit()
+
+    def create(self):
+        with self.lock:
+            cur = self.conn.execute(
+                "INSERT INTO refresh_jobs (status, requested_at) VALUES ('queued', ?)",
+                (time.time(),)
+            )
+            self.conn.commit()
+            return cur.lastrowid
+
+    def update(self, job_id, **fields):
+        with self.lock:
+            self.conn.execute(
+                f"UPDATE refresh_jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+            self.conn.commit()
+
+    def latest(self):
+        with self.lock:
+            cur = self.conn.execute("SELECT * FROM refresh_jobs ORDER BY id DESC LIMIT 1")
+            row = cur.fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(zip([c[0] for c in cur.description], row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+class RefreshWorker:
+    # single background thread fed by a job queue; one refresh at a time per process
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.active = None
+        threading.Thread(target=self.loop, name="refresh-worker", daemon=True).start()
+
+    def submit(self):
+        # a second click while a refresh is queued/running joins the existing job
+        with self.lock:
+            if self.active is None:
+                self.active = self.jobs.create()
+                self.queue.put(self.active)
+            return self.active
+
+    def loop(self):
+        while True:
+            job_id = self.queue.get()
+            self.jobs.update(job_id, status="running")
+
+            def progress(processed, total, riot_id):
+                self.jobs.update(job_id, processed=processed, total=total, current=riot_id)
+
+            try:
+                result = run_refresh(progress)
+                self.jobs.update(job_id, status="done", result=json.dumps(result), finished_at=time.time())
+            except Exception as e:
+                logger.exception("refresh job %s failed", job_id)
+                self.jobs.update(job_id, status="failed", error=str(e), finished_at=time.time())
+            finally:
+                metrics.write()
+                with self.lock:
+                    self.active = None
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# RATINGS
+# =========================================================
+
+# Role benchmark values
+ROLE_STATS = {
+    "Duelist": {"HS%":26, "ACS":265, "KD":1.32},
+    "Controller": {"HS%":22, "ACS":220, "KD":1.18},
+    "Initiator": {"HS%":23, "ACS":235, "KD":1.22},
+    "Sentinel": {"HS%":22, "ACS":230, "KD":1.20},
+    "IGL": {"HS%":20, "ACS":205, "KD":1.10}
+}
+ROLE_TARGETS = {
+    "Duelist": {"Aim":9, "Utility":6.5, "Comms":7, "Entry":10, "Clutch":7.5},
+    "Controller": {"Aim":7.5, "Utility":9, "Comms":8.5, "Entry":6, "Clutch":8.5},
+    "Initiator": {"Aim":8, "Utility":9.5, "Comms":8.5, "Entry":8.5, "Clutch":8},
+    "Sentinel": {"Aim":7.5, "Utility":8.5, "Comms":8, "Entry":5.5, "Clutch":9},
+    "IGL": {"Aim":7, "Utility":8, "Comms":10, "Entry":6.5, "Clutch":9.5}
+}
+
+# ===== ROLE WEIGHTS =====
+ROLE_WEIGHTS = {
+    "Duelist": 0.40,
+    "Initiator": 0.35,
+    "Controller": 0.30,
+    "Sentinel": 0.30,
+    "IGL": 0.25
+}
+
+# ===== SPLIT METRICS =====
+coach_metrics = ["Aim","Utility","Comms","Entry","Clutch"]
+stat_metrics = ["HS%","ACS","KD"]
+
+# role x metric benchmark table (0 / missing -> unrated)
+ROLE_BENCHMARKS = pd.DataFrame({
+    role: {**ROLE_TARGETS[role], **ROLE_STATS[role]} for role in ROLE_TARGETS
+}).T.replace(0, np.nan)
+
+def rate(frame, stats):
+    # 0-10 scores for every row at once, benchmarked against each row's role
+    stats = [s for s in stats if s in frame.columns]
+
+    targets = ROLE_BENCHMARKS.reindex(index=frame["Role"], columns=stats).to_numpy(dtype=float)
+    values = frame[stats].to_numpy(dtype=float)
+
+    return pd.DataFrame(
+        np.clip(values / targets * 10, 0, 10),
+        index=frame.index,
+        columns=stats
+    )
+
+# ===== FINAL SCORE =====
+def final_score(frame):
+    stat_weight = frame["Role"].map(ROLE_WEIGHTS).fillna(0.30)
+    coach_weight = 1 - stat_weight
+
+    coach = frame["CoachScore"].fillna(0)
+    stat  = frame["StatScore"].fillna(0)
+
+    return (coach * coach_weight) + (stat * stat_weight)
+
+metrics = coach_metrics + stat_metrics
+
+def score(frame):
+    # rated copy of the frame with CoachScore / StatScore / Overall added
+    scored = frame.copy()
+
+    rated = rate(scored, metrics)
+    scored[list(rated.columns)] = rated[list(rated.columns)]
+
+    scored["CoachScore"] = scored[coach_metrics].mean(axis=1, skipna=True)
+    scored["StatScore"] = scored[stat_metrics].mean(axis=1, skipna=True)
+    scored["Overall"] = final_score(scored)
+
+    return scored
+
+# =========================================================
+# ROLLING FORM
+# =========================================================
+
+FORM_WINDOW = 3
+
+def player_summary(norm, window=FORM_WINDOW):
+    # one row per player: career mean/consistency, last-N form, mean stats and latest role/agent
+    scored = norm[norm["Overall"].notna()]
+    players = scored.groupby("Player", sort=False)
+
+    summary = players.agg(**{
+        "Overall": ("Overall", "mean"),
+        "Games": ("Overall", "size"),
+        "Std": ("Overall", "std")
+    })
+    summary["Form"] = players.tail(window).groupby("Player", sort=False)["Overall"].mean()
+
+    summary["Consistency"] = np.where(summary["Games"] > 1, (10 - summary["Std"] * 4).clip(lower=0), 10)
+    summary["Impact"] = summary["Overall"]*0.6 + summary["Form"]*0.25 + summary["Consistency"]*0.15
+
+    return summary.drop(columns="Std").join(players.agg(**{
+        "KD": ("KD", "mean"),
+        "HS%": ("HS%", "mean"),
+        "ACS": ("ACS", "mean"),
+        "Role": ("Role", "last"),
+        "Agent": ("Agent", "last")
+    }))
+
+def role_players(norm):
+    # one row per (Role, Player): mean Overall over the rows played in that role, and how many
+    # rated rows there are, so role averages can weight by row like a groupby over the roster
+    return norm.groupby(["Role", "Player"])["Overall"].agg(Overall="mean", Rows="count").reset_index()
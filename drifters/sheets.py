@@ -0,0 +1,52 @@
+from . import config, metrics
+
+SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive"
+]
+
+def sheets_call(call, fn, *args, **kwargs):
+    # every Sheets API round trip goes through here, so the admin panel can count them
+    with metrics.timer("sheets_call", call=call):
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            # e.g. a renamed worksheet or a revoked key: start from a fresh gateway next refresh
+            gateway.cache_clear()
+            raise
+
+class SheetsGateway:
+    # authorized client and worksheet handles, built once per process. gspread wraps the
+    # service account in a google-auth session, which renews the access token when it expires.
+    def __init__(self):
+        # imported here so page loads never pay for the Google client stack, only refreshes do
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
+
+        creds = ServiceAccountCredentials.from_json_keyfile_dict(
+            config.secret("gcp_service_account"),
+            SCOPE
+        )
+
+        self.client = gspread.authorize(creds)
+        self.spreadsheet = sheets_call("open", self.client.open_by_key, config.SPREADSHEET_KEY)
+        self.sheet = sheets_call("worksheet", lambda: self.spreadsheet.sheet1)
+        self.data = sheets_call("worksheet", self.spreadsheet.worksheet, "Data")
+
+    def range(self, worksheet, cells=None):
+        # 'Data'!A2:L9, or the whole worksheet without cells
+        from gspread.utils import absolute_range_name
+
+        return absolute_range_name(worksheet.title, cells)
+
+    def read(self, *ranges):
+        # several A1 ranges in one values:batchGet round trip, each padded like get_all_values()
+        from gspread.utils import fill_gaps
+
+        response = sheets_call("values_batch_get", self.spreadsheet.values_batch_get, list(ranges))
+        return [fill_gaps(r.get("values", [])) for r in response["valueRanges"]]
+
+@config.singleton
+def gateway():
+    # shared by the dashboard's refresh worker and the headless CLI
+    return SheetsGateway()
@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import threading
+
+import streamlit as st
+
+from . import agents, charts, config, data, henrik, metrics, scoring
+from .refresh import RefreshJobs, RefreshWorker
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# CACHED DATA (shared by every session, keyed on the data version)
+# =========================================================
+
+@st.cache_resource
+def sheet_csv_cache():
+    # url -> last export (validators, body, digest), shared by every session
+    return {}
+
+@st.cache_data(max_entries=4)
+def parse_live(digest, _body):
+    # keyed on the raw export digest, so an unchanged sheet is never re-parsed
+    with metrics.timer("parse", sheet="Sheet1"):
+        return data.parse_live(_body)
+
+@st.cache_data(max_entries=4)
+def parse_history(digest, _body):
+    with metrics.timer("parse", sheet="Data"):
+        return data.parse_history(_body)
+
+@st.cache_data(max_entries=4)
+def read_snapshot(snapshot_version):
+    with metrics.timer("parse", sheet="snapshot"):
+        return data.history_snapshot().read()
+
+@st.cache_data(ttl=30)
+def load():
+    # only runs on a cache miss; app.py times every call, so the admin panel can show the hit rate
+    metrics.count("load_misses")
+    snapshot = data.history_snapshot()
+    cache = sheet_csv_cache()
+
+    # the Data sheet stays the source of truth; both exports are conditional requests
+    live, hist = data.fetch_exports(cache)
+
+    if snapshot.source()["digest"] != hist["digest"]:
+        # a refresh (here or on another host) or hand edits: fold the export into the snapshot.
+        # Normally only the newest month's rows are parsed; see HistorySnapshot.sync_export
+        try:
+            with metrics.timer("parse", sheet="Data"):
+                snapshot.sync_export(hist["body"], hist["digest"])
+        except Exception:
+            logger.warning("could not write the history snapshot", exc_info=True)
+
+    if snapshot.source()["digest"] == hist["digest"]:
+        history_version = snapshot.version()
+        history = read_snapshot(history_version)
+    else:
+        # snapshot not writable here: serve the parsed export
+        history_version = hist["digest"]
+        history = parse_history(hist["digest"], hist["body"])
+
+    df = parse_live(live["digest"], live["body"])
+
+    # used as the cache key for everything derived from the sheets
+    version = hashlib.sha1((live["digest"] + history_version).encode()).hexdigest()
+
+    return df, history, version
+
+@st.cache_data(max_entries=4)
+def scored_roster(version, _df):
+    with metrics.timer("scoring", stage="score"):
+        return scoring.score(_df)
+
+@st.cache_data(max_entries=4)
+def player_summary(version, _norm):
+    # one row per player, shared by every dashboard section
+    with metrics.timer("scoring", stage="summary"):
+        return scoring.player_summary(_norm)
+
+@st.cache_data(max_entries=4)
+def role_players(version, _norm):
+    # per (Role, Player), for Best Player Per Role and the role averages
+    with metrics.timer("scoring", stage="roles"):
+        return scoring.role_players(_norm)
+
+# =========================================================
+# PER-PLAYER INPUTS (reused across player switches and fragment reruns)
+# =========================================================
+
+@st.cache_data(max_entries=64)
+def player_rows(version, player, _norm):
+    return _norm[(_norm["Player"]==player)&(_norm["Overall"].notna())]
+
+@st.cache_data(max_entries=64)
+def player_history(version, player, _history):
+    return _history[_history["Player"] == player]
+
+@st.cache_data(max_entries=64)
+def player_trend(version, player, _history):
+    return charts.player_trend(player_history(version, player, _history))
+
+@st.cache_data(max_entries=64)
+def player_acts(version, player, _history):
+    return charts.act_summary(charts.rated_history(player_history(version, player, _history)), henrik.act_stats(player))
+
+# =========================================================
+# FIGURES
+# =========================================================
+
+@st.cache_resource
+def figure_cache():
+    return charts.FigureCache(config.FIGURE_CACHE_SIZE)
+
+def figure(chart, player, version, build):
+    # skips the pandas prep and Plotly construction when nothing changed
+    return figure_cache().get((chart, player, version), build)
+
+# =========================================================
+# AGENT ICONS
+# =========================================================
+
+@st.cache_resource
+def agent_icons():
+    # fills static/agents/ once per process without blocking the page; cards show
+    # the placeholder for anything not on disk yet
+    threading.Thread(target=agents.fetch_icons, name="agent-icons", daemon=True).start()
+
+# =========================================================
+# REFRESH WORKER
+# =========================================================
+
+@st.cache_resource
+def refresh_worker():
+    return RefreshWorker(RefreshJobs(config.CACHE_DB))
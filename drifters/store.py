@@ -0,0 +1,338 @@
+import sqlite3
+import threading
+import time
+
+try:
+    import ijson
+except ModuleNotFoundError:  # optional: without it the payload is parsed whole
+    ijson = None
+
+from . import config
+
+# =========================================================
+# ACCOUNT CACHE
+# =========================================================
+
+class AccountCache:
+    # Riot ID -> (puuid, region), persisted in SQLite so a refresh skips the account lookup
+    def __init__(self, path, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS accounts (
+                riot_id TEXT PRIMARY KEY,
+                puuid TEXT NOT NULL,
+                region TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, riot_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT puuid, region, resolved_at FROM accounts WHERE riot_id = ?",
+                (riot_id,)
+            ).fetchone()
+
+        if row is None or time.time() - row[2] > self.ttl:
+            return None
+
+        return row[0], row[1]
+
+    def put(self, riot_id, puuid, region):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?)",
+                (riot_id, puuid, region, time.time())
+            )
+            self.conn.commit()
+
+    def puuid(self, riot_id):
+        # ignores the TTL: an old entry still names the player whose matches are stored
+        with self.lock:
+            row = self.conn.execute("SELECT puuid FROM accounts WHERE riot_id = ?", (riot_id,)).fetchone()
+        return row[0] if row else None
+
+    def invalidate(self, riot_id):
+        with self.lock:
+            self.conn.execute("DELETE FROM accounts WHERE riot_id = ?", (riot_id,))
+            self.conn.commit()
+
+@config.singleton
+def account_cache():
+    return AccountCache(config.CACHE_DB, config.ACCOUNT_CACHE_TTL)
+
+# =========================================================
+# MATCH STORE
+# =========================================================
+
+NON_COMPETITIVE = [
+    "deathmatch",
+    "swift",
+    "spike",
+    "escalation",
+    "replication",
+    "snowball",
+    "custom"
+]
+
+def is_competitive(metadata):
+    queue = str(metadata.get("queue", "")).lower()
+    mode  = str(metadata.get("mode", "")).lower()
+
+    # skip obvious non-competitive modes
+    return not any(x in (queue + mode) for x in NON_COMPETITIVE)
+
+def match_rows(matches, puuids):
+    # one row of raw stats per match for every given player in it, in a single pass over all_players
+    rows = []
+
+    for match in matches:
+
+        metadata = match["metadata"]
+        rounds = max(1, metadata.get("rounds_played", 1))
+
+        for p in match["players"]["all_players"]:
+
+            if p.get("puuid") not in puuids:
+                continue
+
+            stats = p["stats"]
+
+            rows.append((
+                metadata["matchid"],
+                p["puuid"],
+                metadata.get("game_start", 0),
+                int(is_competitive(metadata)),
+                rounds,
+                stats["kills"],
+                stats["deaths"],
+                stats["assists"],
+                stats.get("damage_made", 0),
+                stats["headshots"],
+                stats["bodyshots"],
+                stats["legshots"]
+            ))
+
+    return rows
+
+# =========================================================
+# MATCH PAYLOADS
+#   a v3 matches page is several MB (rounds, kills, economy for all 10 players);
+#   only each match's metadata and the roster players' stats blocks are kept
+# =========================================================
+
+def trim_match(match, puuids):
+    return {
+        "metadata": match["metadata"],
+        "players": {"all_players": [p for p in match["players"]["all_players"] if p.get("puuid") in puuids]}
+    }
+
+def read_matches(response, puuids):
+    # response: a streamed (stream=True) HenrikDev matches response.
+    # With ijson, matches are decoded one at a time straight off the socket and trimmed
+    # before the next one, so memory is bounded by a single match instead of the whole page.
+    if ijson is None:
+        return [trim_match(m, puuids) for m in response.json()["data"]]
+
+    response.raw.decode_content = True
+    try:
+        return [trim_match(m, puuids) for m in ijson.items(response.raw, "data.item", use_float=True)]
+    finally:
+        response.close()
+
+class MatchStore:
+    # per-player match stats keyed by match id, so a refresh only downloads new games
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS matches (
+                match_id TEXT NOT NULL,
+                puuid TEXT NOT NULL,
+                game_start INTEGER NOT NULL,
+                competitive INTEGER NOT NULL,
+                rounds INTEGER NOT NULL,
+                kills INTEGER NOT NULL,
+                deaths INTEGER NOT NULL,
+                assists INTEGER NOT NULL,
+                damage INTEGER NOT NULL,
+                headshots INTEGER NOT NULL,
+                bodyshots INTEGER NOT NULL,
+                legshots INTEGER NOT NULL,
+                PRIMARY KEY (match_id, puuid)
+            )
+        """)
+        # newest game seen on each player's own matches page; rows picked up from
+        # teammates' pages don't count, since they say nothing about the player's other games
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS synced (
+                puuid TEXT PRIMARY KEY,
+                newest INTEGER NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def watermark(self, puuid):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT newest FROM synced WHERE puuid = ?", (puuid,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, puuid, newest):
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO synced VALUES (?, ?) ON CONFLICT(puuid) DO UPDATE SET newest = MAX(newest, excluded.newest)",
+                (puuid, newest)
+            )
+            self.conn.commit()
+
+    def new_matches(self, puuid, matches):
+        ids = [m["metadata"]["matchid"] for m in matches]
+
+        with self.lock:
+            known = {
+                r[0] for r in self.conn.execute(
+                    f"SELECT match_id FROM matches WHERE puuid = ? AND match_id IN ({','.join('?' * len(ids))})",
+                    (puuid, *ids)
+                )
+            }
+
+        return [m for m in matches if m["metadata"]["matchid"] not in known]
+
+    def add(self, rows):
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.commit()
+
+    def summary(self, puuid, since=0):
+        # KD / ACS / HS% over the latest MATCH_WINDOW competitive matches since `since`
+        with self.lock:
+            row = self.conn.execute(f"""
+                SELECT {TOTALS}
+                FROM (
+                    SELECT * FROM matches
+                    WHERE puuid = ? AND competitive = 1 AND game_start >= ?
+                    ORDER BY game_start DESC
+                    LIMIT ?
+                )
+            """, (puuid, since, config.MATCH_WINDOW)).fetchone()
+
+        return match_stats(row)
+
+    def act_summaries(self, puuid, acts):
+        # acts: [(name, start)] oldest first -> {name: Games / KD / ACS / HS% over every competitive
+        # match stored for the act}; acts without any are left out
+        ends = [start for _, start in acts[1:]] + [2 ** 62]
+
+        with self.lock:
+            rows = {
+                name: self.conn.execute(f"""
+                    SELECT {TOTALS} FROM matches
+                    WHERE puuid = ? AND competitive = 1 AND game_start >= ? AND game_start < ?
+                """, (puuid, start, end)).fetchone()
+                for (name, start), end in zip(acts, ends)
+            }
+
+        return {name: {"Games": row[0], **match_stats(row)} for name, row in rows.items() if row[0]}
+
+TOTALS = """
+    COUNT(*), SUM(kills), SUM(deaths), SUM(assists), SUM(damage),
+    SUM(headshots), SUM(headshots + bodyshots + legshots), SUM(rounds)
+"""
+
+def match_stats(totals):
+    games, kills, deaths, assists, damage, headshots, shots, rounds = totals
+
+    if games == 0:
+        return None
+
+    # ===== FINAL STATS =====
+    KD  = kills / max(1, deaths)
+    ACS = (damage + (kills * 150) + (assists * 50)) / max(1, rounds)
+    HS  = (headshots / max(1, shots)) * 100
+
+    return {
+        "KD": round(KD, 2),
+        "ACS": round(ACS, 1),
+        "HS%": round(HS, 1)
+    }
+
+@config.singleton
+def match_store():
+    return MatchStore(config.CACHE_DB)
+
+# =========================================================
+# HISTORY INDEX
+# =========================================================
+
+class HistoryIndex:
+    # (date, Riot ID) -> Data sheet row number, plus how many rows the sheet has,
+    # so a refresh reads and writes only today's rows instead of the whole sheet
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS history_rows (
+                date TEXT NOT NULL,
+                player TEXT NOT NULL,
+                row INTEGER NOT NULL,
+                PRIMARY KEY (date, player)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS history_extent (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                rows INTEGER NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def extent(self):
+        # last row number in use (1 = header only), None until the first rebuild
+        with self.lock:
+            row = self.conn.execute("SELECT rows FROM history_extent").fetchone()
+        return row[0] if row else None
+
+    def rows(self, date):
+        # Riot ID -> row for one day
+        with self.lock:
+            return dict(self.conn.execute(
+                "SELECT player, row FROM history_rows WHERE date = ? ORDER BY row", (date,)
+            ))
+
+    def add(self, keyed_rows):
+        # [(date, Riot ID, row)]; the last row wins for a repeated key, like a dict
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO history_rows VALUES (?, ?, ?)", keyed_rows)
+            self.conn.execute(
+                "INSERT INTO history_extent VALUES (0, ?) ON CONFLICT(id) DO UPDATE SET rows = MAX(rows, excluded.rows)",
+                (max((r for _, _, r in keyed_rows), default=1),)
+            )
+            self.conn.commit()
+
+    def rebuild(self, values):
+        # values: the whole Data sheet, header first
+        with self.lock:
+            self.conn.execute("DELETE FROM history_rows")
+            self.conn.execute("INSERT OR REPLACE INTO history_extent VALUES (0, ?)", (max(1, len(values)),))
+            self.conn.commit()
+
+        self.add([(r[0], r[1], i) for i, r in enumerate(values[1:], start=2) if len(r) >= 2])
+
+    def clear(self):
+        # forces a rebuild on the next refresh
+        with self.lock:
+            self.conn.execute("DELETE FROM history_rows")
+            self.conn.execute("DELETE FROM history_extent")
+            self.conn.commit()
+
+@config.singleton
+def history_index():
+    return HistoryIndex(config.CACHE_DB)
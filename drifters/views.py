@@ -0,0 +1,617 @@
+import base64
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+
+from . import agents, charts, config, state
+from .metrics import REGISTRY
+from .scoring import metrics
+
+# =========================================================
+# BACKGROUND
+# =========================================================
+
+@st.cache_resource
+def static_url(path, inline=False):
+    # served by Streamlit static serving; inlined once per process as a fallback
+    path = Path(path)
+    static = config.ROOT / "static"
+    if not inline and st.get_option("server.enableStaticServing") and static in path.parents:
+        return f"app/static/{path.relative_to(static).as_posix()}"
+
+    mime = "video/mp4" if path.suffix == ".mp4" else f"image/{path.suffix.lstrip('.')}"
+    return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode()}"
+
+def set_background(video=config.ROOT / "static/background.mp4", poster=config.ROOT / "static/background.jpg"):
+    mode = config.secret("BACKGROUND_MODE", "video")  # video | poster | none
+    video, poster = Path(video), Path(poster)
+    poster_url = static_url(poster) if poster.exists() else ""
+
+    if mode == "video" and video.exists():
+        media = f"""
+        <video autoplay muted loop playsinline id="bgvid" poster="{poster_url}">
+            <source src="{static_url(video)}" type="video/mp4">
+        </video>"""
+    elif mode != "none" and poster_url:
+        media = f'<div id="bgvid" style="background:url({poster_url}) center/cover;"></div>'
+    else:
+        return
+
+    st.markdown(f"""
+    <style>
+    .block-container {{padding:0rem 1.5rem 0rem 1.5rem!important;max-width:100%!important;}}
+    header, footer {{visibility:hidden;}}
+    .stApp {{background:transparent;}}
+    #bgvid {{position:fixed;top:0;left:0;width:100vw;height:100vh;object-fit:cover;z-index:-1000;filter:brightness(.25);}}
+    .overlay {{position:fixed;inset:0;background:radial-gradient(circle,rgba(255,70,85,.15),rgba(0,0,0,.95));z-index:-999;}}
+    </style>
+    {media}
+    <div class="overlay"></div>
+    """, unsafe_allow_html=True)
+
+# =========================================================
+# STYLE
+# =========================================================
+
+def style():
+    st.markdown("""
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Teko:wght@600;700&display=swap');
+
+    .card{
+        background:rgba(20,20,25,.65);
+        border:1px solid rgba(255,70,85,.4);
+        border-radius:8px;
+        padding:18px;
+        margin-bottom:18px;
+        backdrop-filter:blur(6px);
+    }
+
+    .section-title{
+        font-size:18px;
+        color:#ff4655;
+        margin-bottom:14px;
+        font-weight:700;
+    }
+
+    .rankrow{
+        display:flex;
+        align-items:center;
+        gap:14px;
+        padding:10px;
+        margin-bottom:8px;
+        background:rgba(255,255,255,.03);
+        border-radius:6px
+    }
+
+    .rankrow img{
+        height:46px;
+        border-radius:4px
+    }
+
+    /* ===== VALORANT HEADER ===== */
+
+    .valorant-title {
+        font-family: 'Teko', sans-serif;
+        font-size: 80px;
+        font-weight: 700;
+        letter-spacing: 8px;
+        text-align: center;
+        text-transform: uppercase;
+        margin-top: 30px;
+
+        background: linear-gradient(180deg, #ffffff 0%, #ffb3b8 40%, #ff4655 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+
+        text-shadow:
+            0 0 8px rgba(255,70,85,0.5),
+            0 0 20px rgba(255,70,85,0.25);
+    }
+
+    .valorant-sub {
+        font-family: 'Teko', sans-serif;
+        font-size: 44px;
+        letter-spacing: 6px;
+        text-align: center;
+        text-transform: uppercase;
+        color: #ff4655;
+        margin-top: -25px;
+    }
+
+    .valorant-line {
+        width: 160px;
+        height: 3px;
+        margin: 20px auto;
+        background: linear-gradient(to right, transparent, #ff4655, transparent);
+    }
+
+    .valorant-tag {
+        text-align: center;
+        color: #9ca3af;
+        font-size: 15px;
+        letter-spacing: 1px;
+        margin-bottom: 40px;
+    }
+    /* ===== CARD ANIMATION ===== */
+
+    .card-anim {
+        transition: all 0.25s ease;
+    }
+
+    .card-anim:hover {
+        transform: scale(1.03);
+        box-shadow: 0 0 25px rgba(255,70,85,0.4);
+    }
+
+    /* ===== MVP GLOW ===== */
+
+    .mvp {
+        border: 2px solid gold !important;
+        box-shadow: 0 0 20px gold;
+    }
+    /* ===== ROLE BADGES ===== */
+
+    .badge {
+        padding: 3px 8px;
+        border-radius: 6px;
+        font-size: 11px;
+        margin-left: 6px;
+    }
+
+    .badge-duelist { background:#ff4655; color:white; }
+    .badge-controller { background:#3b82f6; color:white; }
+    .badge-initiator { background:#10b981; color:white; }
+    .badge-sentinel { background:#f59e0b; color:black; }
+    .badge-igl { background:#8b5cf6; color:white; }
+
+    .stat-row{
+        display:flex;
+        gap:12px;
+        margin-top:10px;
+    }
+
+    .stat-box{
+        background:rgba(255,255,255,0.05);
+        padding:6px 10px;
+        border-radius:6px;
+        display:flex;
+        flex-direction:column;
+        min-width:70px;
+    }
+
+    .stat-label{
+        font-size:10px;
+        color:#9ca3af;
+        text-transform:uppercase;
+    }
+
+    .stat-value{
+        font-size:14px;
+        color:white;
+        font-weight:600;
+    }
+
+    .mvp-tag{
+        margin-top:8px;
+        color:gold;
+        font-weight:bold;
+        font-size:13px;
+    }
+
+    </style>
+    """, unsafe_allow_html=True)
+
+def header():
+    st.markdown('<div class="valorant-title">Game Drifters</div>', unsafe_allow_html=True)
+    st.markdown('<div class="valorant-sub">Valorant Roster</div>', unsafe_allow_html=True)
+    st.markdown('<div class="valorant-line"></div>', unsafe_allow_html=True)
+    st.markdown('<div class="valorant-tag">Members Performance Analytics</div>', unsafe_allow_html=True)
+
+# =========================================================
+# UPDATE TRACKER BUTTON
+# =========================================================
+
+def refresh_panel(worker, reload):
+    if st.button("Update Stats"):
+        st.session_state["refresh_job"] = worker.submit()
+
+    job = worker.jobs.latest()
+    refreshing = job is not None and job["status"] in ("queued", "running")
+
+    @st.fragment(run_every=2 if refreshing else None)
+    def refresh_status():
+        # polls the worker; viewers keep using the dashboard while a refresh runs
+        job = worker.jobs.latest()
+
+        if job is None:
+            return
+
+        if job["status"] == "queued":
+            st.session_state["refresh_job"] = job["id"]
+            st.progress(0.0, text="Refresh queued...")
+            return
+
+        if job["status"] == "running":
+            st.session_state["refresh_job"] = job["id"]
+            done = job["processed"] / job["total"] if job["total"] else 0.0
+            st.progress(done, text=f"Checked: {job['current']}" if job["current"] else "Fetching player stats...")
+            return
+
+        # finished: reload the sheet data once for sessions that watched it, then report
+        if st.session_state.get("refresh_job") == job["id"]:
+            del st.session_state["refresh_job"]
+            st.session_state["refresh_outcome"] = job
+            reload()
+            st.rerun()
+
+    refresh_status()
+
+    outcome = st.session_state.pop("refresh_outcome", None)
+
+    if outcome and outcome["status"] == "done":
+        for riot_id in outcome["result"]["missing"]:
+            st.warning(f"No recent match data → {riot_id}")
+        st.success(f"{outcome['result']['updated']} players updated correctly ✅")
+    elif outcome:
+        st.error(f"Refresh {outcome['status']}: {outcome['error'] or 'the app restarted mid-refresh'}")
+
+# =========================================================
+# AGENT ICONS
+# =========================================================
+
+def agent_img(agent, inline=False):
+    # local thumbnail when we have it, the lettered placeholder otherwise
+    path = agents.icon_file(agent)
+    if path is None:
+        return agents.placeholder(agent) if agents.icon_key(agent) else ""
+    return static_url(path, inline)
+
+# =========================================================
+# PLAYER CARD AND TEAM RANK
+# =========================================================
+
+def highlight_card(player, summary, rank):
+
+    if player not in summary.index:
+        return ""
+
+    pdata = summary.loc[player]
+
+    overall = pdata["Overall"]
+    form = pdata["Form"]
+
+    hs = pdata["HS%"]
+    kd = pdata["KD"]
+
+    role = pdata["Role"] if pd.notna(pdata["Role"]) else ""
+    role_class = f"badge-{role.lower()}" if role else "badge"
+
+    tier = "S" if overall >= 9 else "A" if overall >= 8 else "B" if overall >= 7 else "C"
+    mvp_class = "mvp" if rank == 1 else ""
+
+    # the top performers grid renders in an iframe, so its icons are inlined
+    img = agent_img(pdata["Agent"], inline=True)
+
+    img_tag = f'<img src="{img}" style="height:70px;width:70px;border-radius:8px;object-fit:cover;">' if img else ""
+
+    return f"""<div class="card-anim {mvp_class}" style="display:flex;align-items:center;gap:14px;background:linear-gradient(135deg, rgba(255,70,85,.25), rgba(0,0,0,.9));border:1px solid rgba(255,70,85,.5);border-radius:12px;padding:18px;margin-bottom:15px;">
+    {img_tag}
+    <div style="flex:1;">
+    
+    <div style="display:flex;justify-content:space-between;align-items:center;">
+    <div style="display:flex;align-items:center;gap:8px;">
+    <b style="color:white;font-size:18px;">{player}</b>
+    <span class="badge {role_class}">{role}</span>
+    </div>
+    <span style="color:#ff4655;font-weight:bold;">#{rank} {tier}</span>
+    </div>
+    
+    <div class="stat-row">
+    <div class="stat-box">
+    <span class="stat-label">Overall</span>
+    <span class="stat-value">{overall:.2f}</span>
+    </div>
+    
+    <div class="stat-box">
+    <span class="stat-label">Form</span>
+    <span class="stat-value">{form:.2f}</span>
+    </div>
+    </div>
+    
+    <div class="stat-row">
+    <div class="stat-box">
+    <span class="stat-label">HS%</span>
+    <span class="stat-value">{hs:.1f}%</span>
+    </div>
+    
+    <div class="stat-box">
+    <span class="stat-label">K/D</span>
+    <span class="stat-value">{kd:.2f}</span>
+    </div>
+    </div>
+    
+    {"<div class='mvp-tag'>MVP</div>" if rank==1 else ""}
+    
+    </div>
+    </div>"""
+
+# =========================
+# TOP PERFORMERS (GLOBAL)
+# =========================
+
+def top_performers(summary):
+    st.markdown('<div class="card"><div class="section-title">Top Performers</div>',unsafe_allow_html=True)
+    top_players = summary["Overall"].sort_values(ascending=False).head(5).index
+    html_block = ""
+    for i, p in enumerate(top_players, start=1):
+        html_block += highlight_card(p, summary, i)
+
+    components.html(f"""
+    <style>
+    body {{
+        margin:0;
+        padding:12px;
+        font-family:'Teko',sans-serif;
+        background:transparent;
+    }}
+
+    /* ===== GRID (FIXED 3 PER ROW) ===== */
+    .grid {{
+        display:grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap:20px;
+    }}
+
+    /* ===== CARD ===== */
+    .card {{
+        display:flex;
+        gap:14px;
+        padding:16px;
+        border-radius:12px;
+        background:linear-gradient(135deg, rgba(255,70,85,.35), rgba(0,0,0,.95));
+        border:1px solid rgba(255,70,85,.6);
+        transition:0.25s;
+        min-height:110px;
+    }}
+
+    .card:hover {{
+        transform:scale(1.04);
+        box-shadow:0 0 25px rgba(255,70,85,.5);
+    }}
+
+    /* ===== MVP BIG ===== */
+    .mvp {{
+        grid-column: span 2;
+        border:2px solid gold;
+        box-shadow:0 0 25px gold;
+    }}
+
+    /* ===== IMAGE ===== */
+    .card img {{
+        width:70px;
+        height:70px;
+        border-radius:8px;
+    }}
+
+    /* ===== TEXT ===== */
+    .name {{
+        font-size:18px;
+        color:white;
+    }}
+
+    .rank {{
+        color:#ff4655;
+        font-size:13px;
+        font-weight:bold;
+    }}
+
+    /* ===== BADGES ===== */
+    .badge {{
+        padding:3px 8px;
+        border-radius:6px;
+        font-size:10px;
+    }}
+
+    .badge-duelist {{background:#ff4655;color:white;}}
+    .badge-controller {{background:#3b82f6;color:white;}}
+    .badge-initiator {{background:#10b981;color:white;}}
+    .badge-sentinel {{background:#f59e0b;color:black;}}
+
+    /* ===== STATS ===== */
+    .stats {{
+        margin-top:6px;
+        font-size:13px;
+        color:#e5e7eb;
+    }}
+
+    .mvp-tag {{
+        color:gold;
+        margin-top:6px;
+        font-size:13px;
+    }}
+    </style>
+
+    <div class="grid">
+    {html_block
+        .replace('card-anim', 'card')
+        .replace('stat-row', 'stats')
+        .replace('stat-box','')
+        .replace('stat-label','')
+        .replace('stat-value','')
+    }
+    </div>
+    """, height=450)
+
+    st.markdown("</div>",unsafe_allow_html=True)
+
+def best_per_role(roles):
+    role_best = roles[["Role","Player","Overall"]].dropna(subset=["Overall"])
+
+    role_best = role_best.loc[
+        role_best.groupby("Role")["Overall"].idxmax()
+    ]
+
+    st.markdown('<div class="card"><div class="section-title">Best Player Per Role</div>', unsafe_allow_html=True)
+
+    role_order = ["Duelist","Initiator","Controller","Sentinel","IGL"]
+    role_best = role_best.set_index("Role").reindex(role_order).dropna().reset_index()
+    cols = st.columns(len(role_best))
+
+    for i, (_, row) in enumerate(role_best.iterrows()):
+        with cols[i]:
+            st.markdown(f"""
+            <div style="
+            background:rgba(20,20,25,.7);
+            border:1px solid rgba(255,70,85,.3);
+            border-radius:10px;
+            padding:12px;
+            text-align:center;
+            ">
+
+            <div style="color:#9ca3af;font-size:12px;">{row['Role']}</div>
+            <div style="color:white;font-size:16px;font-weight:bold;">{row['Player']}</div>
+            <div style="color:#ff4655;font-size:14px;">{row['Overall']:.2f}</div>
+
+            </div>
+            """, unsafe_allow_html=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# =========================================================
+# PLAYER ANALYTICS
+# =========================================================
+
+def player_analytics(summary, player, version):
+    career, form, consistency, impact = summary.loc[player, ["Overall","Form","Consistency","Impact"]]
+
+    def gauge(title, value):
+        return state.figure(f"gauge:{title}", player, version, lambda: charts.gauge(title, value))
+
+    st.markdown('<div class="card"><div class="section-title">Player Analytics</div>',unsafe_allow_html=True)
+    c1,c2,c3,c4=st.columns(4)
+    c1.plotly_chart(gauge("Performance",career),width="stretch")
+    c2.plotly_chart(gauge("Consistency",consistency),width="stretch")
+    c3.plotly_chart(gauge("Form",form),width="stretch")
+    c4.plotly_chart(gauge("Impact",impact),width="stretch")
+    st.markdown("</div>",unsafe_allow_html=True)
+
+# =========================================================
+# PRO ANALYTICS DASHBOARD
+# =========================================================
+
+def advanced_analytics(version, player, norm, history, roles):
+    st.markdown('<div class="card"><div class="section-title">Advanced Analytics</div>',unsafe_allow_html=True)
+
+    pn = lambda: state.player_rows(version, player, norm)
+    trend = state.player_trend(version, player, history)
+
+    # ===== DASHBOARD LAYOUT =====
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if not trend.empty:
+            st.plotly_chart(state.figure("trend", player, version, lambda: charts.trend_figure(trend)),width="stretch")
+        st.plotly_chart(state.figure("mech", player, version, lambda: charts.mech_figure(pn())),width="stretch")
+
+    with col2:
+        st.plotly_chart(state.figure("coach", player, version, lambda: charts.coach_figure(pn())),width="stretch")
+        st.plotly_chart(state.figure("radar", player, version, lambda: charts.radar_figure(pn())),width="stretch")
+
+    st.plotly_chart(state.figure("role", None, version, lambda: charts.role_figure(roles)),width="stretch")
+
+    st.markdown("</div>",unsafe_allow_html=True)
+
+# =========================================================
+# ACT COMPARISON
+# =========================================================
+
+def act_comparison(version, player, history):
+    acts = state.player_acts(version, player, history)
+    if acts.empty:
+        return
+
+    st.markdown('<div class="card"><div class="section-title">Act Comparison</div>',unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    col1.plotly_chart(state.figure("acts", player, version, lambda: charts.act_figure(acts)),width="stretch")
+    col2.dataframe(acts.set_index("Act"),width="stretch")
+    st.caption("Overall is the mean of the player's daily ratings in each act. Games, KD, ACS and HS% cover every competitive match of the act stored by refreshes on this host; acts without any are blank.")
+
+    st.markdown("</div>",unsafe_allow_html=True)
+
+# =========================================================
+# PERFORMANCE BREAKDOWN
+# =========================================================
+
+def performance_breakdown(version, player, history):
+    st.markdown('<div class="card"><div class="section-title">Performance Breakdown</div>',unsafe_allow_html=True)
+
+    plot = state.player_history(version, player, history).sort_values("Date").tail(10)
+    if plot.empty:
+        st.info("No historical data yet. Press 'Update Stats' first.")
+        st.stop()
+
+    st.plotly_chart(state.figure("breakdown", player, version, lambda: charts.breakdown_figure(plot)),width="stretch")
+    st.markdown("</div>",unsafe_allow_html=True)
+
+# =========================================================
+# MATCH LOGS
+# =========================================================
+
+def match_logs(pn):
+    st.markdown('<div class="card"><div class="section-title">Match Logs</div>',unsafe_allow_html=True)
+    for d,g in pn.groupby(pn["Date"].dt.date):
+        with st.expander(str(d)):
+            st.dataframe(g[["Role","Overall"]+metrics],width="stretch")
+    st.markdown("</div>",unsafe_allow_html=True)
+
+def team_rankings(summary):
+    st.markdown('<div class="card"><div class="section-title">Team Rankings</div>',unsafe_allow_html=True)
+
+    rank = summary.sort_values(
+            by=["Overall","KD","ACS"],
+            ascending=False
+        )
+
+    for i,(p,row) in enumerate(rank.iterrows(),1):
+        s = row["Overall"]
+        tier="S" if s>=9 else "A" if s>=8 else "B" if s>=7 else "C"
+        img=agent_img(row["Agent"])
+
+        st.markdown(f"""
+        <div class="rankrow">
+            <img src="{img}">
+            <div>
+            <b style='color:white'>{i}. {p}</b><br>
+            <span style='color:#ff4655'>{s:.2f}/10 ({tier})</span>
+            </div>
+        </div>
+        """,unsafe_allow_html=True)
+
+    st.markdown("</div>",unsafe_allow_html=True)
+
+# =========================================================
+# ADMIN (?admin=1)
+# =========================================================
+
+def admin_panel():
+    st.markdown('<div class="card"><div class="section-title">Metrics</div>',unsafe_allow_html=True)
+
+    loads = REGISTRY.calls("load")
+    hits = REGISTRY.value("figure_cache", result="hit")
+    builds = REGISTRY.value("figure_cache", result="miss")
+
+    c1,c2,c3,c4=st.columns(4)
+    c1.metric("load() hit rate", f"{1 - REGISTRY.value('load_misses') / loads:.0%}" if loads else "–")
+    c2.metric("Figure cache hit rate", f"{hits / (hits + builds):.0%}" if hits + builds else "–")
+    c3.metric("HenrikDev 429s", REGISTRY.value("henrik_responses", status="429"))
+    c4.metric("Rate limit wait", f"{REGISTRY.value('henrik_wait_seconds'):.1f}s")
+
+    st.dataframe(pd.DataFrame(REGISTRY.rows()),width="stretch",hide_index=True)
+    st.download_button("Download metrics.prom", REGISTRY.render(), file_name="metrics.prom", mime="text/plain")
+
+    st.markdown("</div>",unsafe_allow_html=True)
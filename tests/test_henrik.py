@@ -0,0 +1,45 @@
+import pytest
+
+from drifters import config, henrik, store
+
+@pytest.fixture
+def match_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DB", tmp_path / "tracker_cache.db")
+    store.match_store.cache_clear()
+    yield store.match_store()
+    store.match_store.cache_clear()
+
+def match(match_id, puuids):
+    return {
+        "metadata": {"matchid": match_id, "game_start": 1780000000, "rounds_played": 20, "mode": "Competitive"},
+        "players": {"all_players": [
+            {"puuid": p, "stats": {"kills": 15, "deaths": 12, "assists": 4, "damage_made": 2800,
+                                   "headshots": 8, "bodyshots": 20, "legshots": 2}}
+            for p in puuids
+        ]}
+    }
+
+def test_shared_match_stored_for_player_missing_it(match_store):
+    # A already has M stored (e.g. B joined the roster later); B's row must still be extracted
+    m = match("M", ["A", "B"])
+    match_store.add(store.match_rows([m], {"A"}))
+
+    plan = henrik.RosterPlan(["A", "B"])
+    plan.record([m], match_store.new_matches("A", [m]))
+    plan.record([m], match_store.new_matches("B", [m]))
+
+    assert match_store.summary("B") is not None
+    assert match_store.new_matches("B", [m]) == []
+
+def test_shared_match_walked_once(match_store):
+    m = match("M", ["A", "B"])
+
+    plan = henrik.RosterPlan(["A", "B"])
+    new_a = match_store.new_matches("A", [m])
+    new_b = match_store.new_matches("B", [m])
+    plan.record([m], new_a)
+    plan.record([m], new_b)
+
+    assert plan.walked == {"M"}
+    assert match_store.summary("A") is not None
+    assert match_store.summary("B") is not None